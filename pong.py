@@ -1,13 +1,27 @@
 import sys
+import os
+import json
 import random
 import string
 import math
+import time
+import threading
+import hashlib
+import hmac
+from collections import Counter, OrderedDict, deque
+import numpy as np
+from PyQt5 import sip
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLineEdit, QPushButton, QLabel, QMessageBox, QDialog, QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QPoint, QRect, pyqtProperty
-from PyQt5.QtGui import (QPainter, QPen, QBrush, QColor, QFont, QImage, QPixmap, 
+from PyQt5.QtCore import (Qt, QTimer, QPropertyAnimation, QEasingCurve, QPoint, QPointF, QRect, QRectF,
+                          QObject, QEvent, QRunnable, QThreadPool, pyqtProperty, pyqtSignal)
+from PyQt5.QtGui import (QGuiApplication, QPainter, QPen, QBrush, QColor, QFont, QImage, QPixmap, 
                          QTransform, QLinearGradient, QRadialGradient, QConicalGradient,
-                         QPainterPath, QFontDatabase, QPalette)
+                         QPainterPath, QFontDatabase, QFontMetrics, QPalette, QRegion)
+from pong_ai import PredictiveController
+from pong_engine import PongEngine
+from pong_throttle import LoginThrottle
+from pong_users import UserStore
 
 class GlowEffect(QGraphicsDropShadowEffect):
     def __init__(self, color):
@@ -17,17 +31,28 @@ class GlowEffect(QGraphicsDropShadowEffect):
         self.setOffset(0, 0)
 
 class AnimatedLabel(QLabel):
+    # Пульсирующее свечение меняет только параметры тени, без перепарсинга стилей
+    GLOW_LEVELS = 16
+
     def __init__(self, text=""):
         super().__init__(text)
         self._glow_intensity = 0
-        self.glow_animation = QPropertyAnimation(self, b"glow_intensity")
-        self.glow_animation.setDuration(2000)
-        self.glow_animation.setLoopCount(-1)
-        self.glow_animation.setKeyValueAt(0, 0)
-        self.glow_animation.setKeyValueAt(0.5, 1)
-        self.glow_animation.setKeyValueAt(1, 0)
+        self._glow_level = None
+        self.setStyleSheet("color: rgba(0, 255, 255, 255);")
+        self.glow_effect = GlowEffect(QColor(255, 0, 255, 0))
+        self.setGraphicsEffect(self.glow_effect)
+        # Пульс 0 -> 1 -> 0 за 2 секунды на общих часах
+        self.glow_animation = AnimationClock.instance().subscribe(self, self.advance_glow)
+        self.glow_animation.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
         self.glow_animation.start()
 
+    def advance_glow(self):
+        phase = AnimationClock.instance().now() % 2000 / 1000
+        self.glow_intensity = 1 - abs(phase - 1)
+
     @pyqtProperty(float)
     def glow_intensity(self):
         return self._glow_intensity
@@ -35,49 +60,1064 @@ class AnimatedLabel(QLabel):
     @glow_intensity.setter
     def glow_intensity(self, value):
         self._glow_intensity = value
-        self.setStyleSheet(f"""
-            color: rgba(0, 255, 255, {255});
-            text-shadow: 0 0 {10 + value * 20}px rgba(255, 0, 255, {200 * value});
-        """)
+        # Тень перерисовывается только при смене ступени яркости
+        level = round(value * self.GLOW_LEVELS)
+        if level == self._glow_level:
+            return
+        self._glow_level = level
+        value = level / self.GLOW_LEVELS
+        self.glow_effect.setBlurRadius(10 + value * 20)
+        self.glow_effect.setColor(QColor(255, 0, 255, int(200 * value)))
+
+class AnimationLifecycle:
+    # Примесь для окон с анимацией: пауза при скрытии, продолжение при показе,
+    # освобождение подписок и буферов частиц при закрытии
+    def animation_timers(self):
+        return [self.particle_timer]
+
+    def resume_animations(self):
+        self.particles.reset_timing()
+        for timer in self.animation_timers():
+            timer.start()
+
+    def pause_animations(self):
+        self.particles.reset_timing()
+        for timer in self.animation_timers():
+            timer.stop()
+
+    def release_animations(self):
+        AnimationClock.instance().cancel_tree(self)
+        self.particles.release()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.resume_animations()
+
+    def hideEvent(self, event):
+        self.pause_animations()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        if event.isAccepted():
+            self.release_animations()
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-        
+    # Пул частиц фиксированной ёмкости: каждое поле хранится в своём массиве
+    ALPHA_BUCKETS = 16
+    SPRITE_MIN_REPEAT = 8
+    SPRITE_MAX_SIZE = 16
+    # Уровень детализации: доля выпускаемых частиц и множитель их жизни
+    MIN_LOD = 0.2
+    LOD_DOWN = 0.95
+    LOD_UP = 0.01
+    FRAME_SMOOTHING = 0.1
+
+    def __init__(self, capacity=8192, frame_budget=512, target_frame_time=1 / 60):
+        self.capacity = capacity
+        self.count = 0
+        # Не больше frame_budget новых частиц между двумя update()
+        self.frame_budget = frame_budget
+        self.spawned = 0
+        # Если кадры дольше целевых, уменьшаем lod, если успеваем - возвращаем
+        self.target_frame_time = target_frame_time
+        self.adaptive = True
+        self.lod = 1.0
+        self.frame_time = target_frame_time
+        self._last_update = None
+        self._carry = 0.0
+        self.colors = []
+        self._color_lookup = {}
+        self._sprites = {}
+        self.allocate(capacity)
+
+    def allocate(self, size):
+        self.x = np.zeros(size, dtype=np.float32)
+        self.y = np.zeros(size, dtype=np.float32)
+        self.vx = np.zeros(size, dtype=np.float32)
+        self.vy = np.zeros(size, dtype=np.float32)
+        self.lifetime = np.zeros(size, dtype=np.float32)
+        self.max_lifetime = np.ones(size, dtype=np.float32)
+        self.size = np.zeros(size, dtype=np.float32)
+        self.color_index = np.zeros(size, dtype=np.int32)
+        self._fields = (self.x, self.y, self.vx, self.vy, self.lifetime,
+                        self.max_lifetime, self.size, self.color_index)
+
+    def release(self):
+        # Освобождает буферы и спрайты; при следующей частице пул выделится заново
+        self.count = 0
+        self._sprites.clear()
+        self.reset_timing()
+        self.allocate(0)
+
+    def reset_timing(self):
+        # Вызывается при паузе и продолжении анимаций: промежуток между ними - не кадр
+        self._last_update = None
+
+    def admit(self, amount):
+        # Сколько частиц из запрошенных выпустить с учётом lod, бюджета кадра и ёмкости.
+        # Дробная часть копится, поэтому одиночные частицы тоже прореживаются.
+        wanted = amount * self.lod + self._carry
+        amount = int(wanted)
+        self._carry = wanted - amount
+        amount = min(amount, self.frame_budget - self.spawned, self.capacity - self.count)
+        if amount <= 0:
+            return 0
+        if not len(self.x):
+            self.allocate(self.capacity)
+        self.spawned += amount
+        return amount
+
+    def scaled_lifetime(self, lifetime):
+        return lifetime * (0.5 + 0.5 * self.lod)
+
+    def measure_frame(self):
+        # Время между кадрами сглаживается. Очень долгие кадры ограничиваются 4 целевыми,
+        # чтобы одна заминка не обрушила lod; паузы окна отсекает reset_timing()
+        now = time.perf_counter()
+        last, self._last_update = self._last_update, now
+        if last is None or not self.adaptive:
+            return
+        elapsed = min(now - last, self.target_frame_time * 4)
+        self.frame_time += (elapsed - self.frame_time) * self.FRAME_SMOOTHING
+        if self.frame_time > self.target_frame_time * 1.2:
+            self.lod = max(self.MIN_LOD, self.lod * self.LOD_DOWN)
+        elif self.frame_time < self.target_frame_time * 1.05:
+            self.lod = min(1.0, self.lod + self.LOD_UP)
+
+    def __len__(self):
+        return self.count
+
+    def _color_id(self, color):
+        rgba = QColor(color).rgba()
+        index = self._color_lookup.get(rgba)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(QColor.fromRgba(rgba))
+            self._color_lookup[rgba] = index
+        return index
+
     def add_particle(self, x, y, color, lifetime=60):
-        self.particles.append({
-            'x': x, 'y': y,
-            'vx': random.uniform(-2, 2),
-            'vy': random.uniform(-2, 2),
-            'color': color,
-            'lifetime': lifetime,
-            'max_lifetime': lifetime,
-            'size': random.uniform(2, 6)
-        })
-        
-    def update(self):
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['lifetime'] -= 1
-            particle['vy'] += 0.1  # гравитация
-            
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                
+        if not self.admit(1):
+            return
+        lifetime = self.scaled_lifetime(lifetime)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = random.uniform(-2, 2)
+        self.vy[i] = random.uniform(-2, 2)
+        self.lifetime[i] = lifetime
+        self.max_lifetime[i] = lifetime
+        self.size[i] = random.uniform(2, 6)
+        self.color_index[i] = self._color_id(color)
+        self.count += 1
+
+    def add_burst(self, x, y, color, amount, lifetime=60):
+        # Пачка частиц из одной точки одной записью в массивы
+        amount = self.admit(amount)
+        if not amount:
+            return
+        lifetime = self.scaled_lifetime(lifetime)
+        s = slice(self.count, self.count + amount)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = np.random.uniform(-2, 2, amount)
+        self.vy[s] = np.random.uniform(-2, 2, amount)
+        self.lifetime[s] = lifetime
+        self.max_lifetime[s] = lifetime
+        self.size[s] = np.random.uniform(2, 6, amount)
+        self.color_index[s] = self._color_id(color)
+        self.count += amount
+
+    def clear(self):
+        self.count = 0
+
+    def occupied_tiles(self, tile):
+        # Клетки сетки tile x tile, в которых сейчас есть частицы
+        n = self.count
+        if not n:
+            return []
+        tx = np.floor_divide(self.x[:n], tile).astype(np.int64)
+        ty = np.floor_divide(self.y[:n], tile).astype(np.int64)
+        keys = np.unique(ty * 65536 + tx + 32768)
+        return [(int(key % 65536) - 32768, int(key // 65536)) for key in keys]
+
+    def update(self, dt=1.0):
+        # dt измеряется в кадрах по 1/60 секунды
+        self.measure_frame()
+        self.spawned = 0
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.lifetime[:n] -= dt
+        self.vy[:n] += 0.1 * dt  # гравитация
+
+        dead = self.lifetime[:n] <= 0
+        dead_count = int(np.count_nonzero(dead))
+        if not dead_count:
+            return
+        # Живые частицы из хвоста переезжают в освободившиеся ячейки
+        alive = n - dead_count
+        holes = np.flatnonzero(dead[:alive])
+        movers = np.flatnonzero(~dead[alive:]) + alive
+        for field in self._fields:
+            field[holes] = field[movers]
+        self.count = alive
+
+    def sprite_strip(self, color_id):
+        # Полоска заранее отрисованных кружков размером 1..SPRITE_MAX_SIZE
+        strip = self._sprites.get(color_id)
+        if strip is None:
+            cell = self.SPRITE_MAX_SIZE + 2
+            strip = QPixmap(cell * self.SPRITE_MAX_SIZE, cell)
+            strip.fill(Qt.transparent)
+            sprite_painter = QPainter(strip)
+            sprite_painter.setRenderHint(QPainter.Antialiasing)
+            sprite_painter.setPen(Qt.NoPen)
+            sprite_painter.setBrush(QBrush(self.colors[color_id]))
+            for size in range(1, self.SPRITE_MAX_SIZE + 1):
+                sprite_painter.drawEllipse((size - 1) * cell + 1, 1, size, size)
+            sprite_painter.end()
+            self._sprites[color_id] = strip
+        return strip
+
+    def draw(self, painter):
+        n = self.count
+        if not n:
+            return
+        ratio = self.lifetime[:n] / self.max_lifetime[:n]
+        buckets = (255 * ratio).astype(np.int32) // (256 // self.ALPHA_BUCKETS)
+        sizes = (self.size[:n] * ratio).astype(np.int32)
+
+        visible = np.flatnonzero((buckets > 0) & (sizes > 0))
+        if not len(visible):
+            return
+        # Сортируем по (цвет, прозрачность, размер), чтобы рисовать группами
+        keys = self.color_index[visible] * self.ALPHA_BUCKETS + buckets[visible]
+        order = np.lexsort((sizes[visible], keys))
+        visible = visible[order]
+        keys = keys[order]
+        sizes = sizes[visible]
+        runs = keys.astype(np.int64) * 256 + np.minimum(sizes, 255)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(runs)) + 1)).tolist()
+        ends = starts[1:] + [len(visible)]
+
+        xs = self.x[visible].astype(np.int32).tolist()
+        ys = self.y[visible].astype(np.int32).tolist()
+        keys = keys.tolist()
+        sizes = sizes.tolist()
+        alpha_step = 255 // (self.ALPHA_BUCKETS - 1)
+        cell = self.SPRITE_MAX_SIZE + 2
+
+        painter.setPen(Qt.NoPen)
+        brush_key = None
+        for start, end in zip(starts, ends):
+            key = keys[start]
+            size = sizes[start]
+            color_id, bucket = divmod(key, self.ALPHA_BUCKETS)
+            if end - start >= self.SPRITE_MIN_REPEAT and size <= self.SPRITE_MAX_SIZE:
+                # Повторяющийся размер штампуем из спрайта одним вызовом
+                source = QRectF((size - 1) * cell, 0, size + 2, size + 2)
+                opacity = bucket * alpha_step / 255
+                half = size / 2
+                fragments = [QPainter.PixmapFragment.create(QPointF(xs[i] + half, ys[i] + half),
+                                                            source, 1, 1, 0, opacity)
+                             for i in range(start, end)]
+                painter.drawPixmapFragments(fragments, self.sprite_strip(color_id))
+                continue
+            if key != brush_key:
+                color = QColor(self.colors[color_id])
+                color.setAlpha(bucket * alpha_step)
+                painter.setBrush(QBrush(color))
+                brush_key = key
+            for i in range(start, end):
+                painter.drawEllipse(xs[i], ys[i], size, size)
+
+class Starfield:
+    # Звезды генерируются один раз из seed и запекаются в несколько слоев
+    def __init__(self, width=800, height=300, count=100, seed=2084, layers=3,
+                 twinkle=True, parallax=0.0):
+        rng = random.Random(seed)
+        self.width, self.height = width, height
+        self.twinkle = twinkle
+        self.parallax = parallax
+        self.stars = [(rng.randint(0, width), rng.randint(0, height), rng.randint(1, 3))
+                      for _ in range(count)]
+        self.layer_count = layers
+        self.phases = [rng.uniform(0, 2 * math.pi) for _ in range(layers)]
+        self.time = 0.0
+        self.offset = 0.0
+        self._layers = None
+
+    def advance(self, dt=1.0):
+        # Мерцание и параллакс зависят только от времени, а не от числа звезд
+        self.time += dt
+        if self.parallax:
+            self.offset = (self.offset + self.parallax * dt) % self.width
+
+    def bake(self):
+        self._layers = []
+        for index in range(self.layer_count):
+            layer = QPixmap(self.width + 4, self.height + 4)
+            layer.fill(Qt.transparent)
+            painter = QPainter(layer)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(Qt.white, 1))
+            for x, y, size in self.stars[index::self.layer_count]:
+                painter.drawEllipse(x, y, size, size)
+            painter.end()
+            self._layers.append(layer)
+
     def draw(self, painter):
-        for particle in self.particles:
-            alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-            size = particle['size'] * (particle['lifetime'] / particle['max_lifetime'])
-            
-            color = QColor(particle['color'])
-            color.setAlpha(alpha)
-            
-            painter.setBrush(QBrush(color))
+        if self._layers is None:
+            self.bake()
+        for index, layer in enumerate(self._layers):
+            if self.twinkle:
+                painter.setOpacity(0.65 + 0.35 * math.sin(self.time * 0.05 + self.phases[index]))
+            # Дальние слои смещаются медленнее ближних
+            shift = int(self.offset * (index + 1) / self.layer_count) % self.width
+            painter.drawPixmap(-shift, 0, layer)
+            if shift:
+                painter.drawPixmap(self.width - shift, 0, layer)
+        painter.setOpacity(1.0)
+
+class ClockSubscription:
+    # Подписка на общие часы: интерфейс как у QTimer (start/stop/isActive)
+    def __init__(self, clock, owner, callback, interval):
+        self.clock = clock
+        self.owner = owner
+        self.callback = callback
+        self.interval = interval
+        self.active = False
+        self.visible = owner.isVisible()
+        self.due = 0.0
+
+    @property
+    def running(self):
+        return self.active and self.visible
+
+    def start(self, interval=None):
+        if interval is not None:
+            self.interval = interval
+        if self not in self.clock.subscriptions:
+            self.clock.subscriptions.append(self)
+            self.visible = self.owner.isVisible()
+        self.active = True
+        self.due = self.clock.now() + self.interval
+        self.clock.reschedule()
+
+    def stop(self):
+        self.active = False
+        self.clock.reschedule()
+
+    def cancel(self):
+        # Останавливает и убирает из часов, чтобы они не держали виджет
+        self.active = False
+        if self in self.clock.subscriptions:
+            self.clock.subscriptions.remove(self)
+        self.clock.reschedule()
+
+    def isActive(self):
+        return self.active
+
+class AnimationClock(QObject):
+    # Один таймер с частотой экрана на все анимации приложения. Подписчики
+    # вызываются на общих тиках со своим интервалом и засыпают, пока их виджет скрыт.
+    # Тики идут в среднем ровно с частотой экрана, но QTimer не синхронизирован
+    # с vsync - это ближайшее приближение без QOpenGLWidget/requestUpdate.
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None or sip.isdeleted(cls._instance):
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        # Часы живут не дольше приложения и останавливаются при его завершении
+        super().__init__(parent)
+        self.epoch = time.perf_counter()
+        self.subscriptions = []
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        self.frame_interval = 1000 / (refresh_rate if refresh_rate > 0 else 60)
+        # Однократный таймер до срока следующего тика: дробный интервал кадра
+        # (16.67 мс при 60 Гц) сохраняется, ошибка округления не накапливается
+        self.next_tick = None
+        self.ticking = False
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+        self.closed = False
+        if parent is not None:
+            parent.aboutToQuit.connect(self.shutdown)
+
+    def shutdown(self):
+        self.closed = True
+        self.timer.stop()
+
+    def alive(self):
+        # При завершении интерпретатора окна могут получить hideEvent после удаления таймера
+        return not self.closed and not sip.isdeleted(self.timer)
+
+    def now(self):
+        return (time.perf_counter() - self.epoch) * 1000
+
+    def subscribe(self, owner, callback, interval=0):
+        subscription = ClockSubscription(self, owner, callback, interval)
+        self.subscriptions.append(subscription)
+        owner.installEventFilter(self)
+        return subscription
+
+    def cancel_tree(self, widget):
+        # Отменяет подписки виджета и всех его потомков
+        for subscription in list(self.subscriptions):
+            owner = subscription.owner
+            if sip.isdeleted(owner) or owner is widget or widget.isAncestorOf(owner):
+                subscription.cancel()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Hide):
+            visible = event.type() == QEvent.Show
+            for subscription in self.subscriptions:
+                if subscription.owner is obj:
+                    subscription.visible = visible
+            self.reschedule()
+        return False
+
+    def running(self):
+        return any(subscription.running for subscription in self.subscriptions)
+
+    def reschedule(self):
+        # Таймер крутится, только пока есть хоть один видимый активный подписчик.
+        # Во время тика решение откладывается до его конца.
+        if self.ticking or not self.alive():
+            return
+        running = self.running()
+        if running and not self.timer.isActive():
+            self.next_tick = self.now() + self.frame_interval
+            self.arm()
+        elif not running and self.timer.isActive():
+            self.timer.stop()
+
+    def arm(self):
+        self.timer.start(max(0, round(self.next_tick - self.now())))
+
+    def tick(self):
+        now = self.now()
+        self.next_tick += self.frame_interval
+        if self.next_tick <= now:
+            # Пропущенные кадры не догоняем
+            self.next_tick = now + self.frame_interval
+        self.ticking = True
+        # Подписчик срабатывает на тике, ближайшем к его сроку;
+        # интервалы короче полутора кадров - на каждом тике
+        horizon = now + self.frame_interval / 2
+        for subscription in list(self.subscriptions):
+            if sip.isdeleted(subscription.owner):
+                self.subscriptions.remove(subscription)
+                continue
+            if not subscription.running:
+                continue
+            if subscription.interval >= self.frame_interval * 1.5 and subscription.due > horizon:
+                continue
+            subscription.due += subscription.interval
+            if subscription.due <= now:
+                subscription.due = now + subscription.interval
+            subscription.callback()
+        self.ticking = False
+        if self.running() and self.alive():
+            self.arm()
+
+class GameLoop:
+    # Физика идет фиксированным шагом, отрисовка - со своей частотой на общих часах.
+    # Часы тикают с частотой экрана, поэтому render_hz выше нее (144 на 60 Гц мониторе)
+    # фактически ограничивается частотой экрана.
+    def __init__(self, owner, step, render, physics_hz=120, render_hz=60, max_steps=8):
+        self.step = step
+        self.render = render
+        self.physics_dt = 1.0 / physics_hz
+        self.render_interval = 1000 / render_hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped_steps = 0
+        self.timer = AnimationClock.instance().subscribe(owner, self.tick, self.render_interval)
+
+    def start(self):
+        self.last_time = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        elapsed = min(now - self.last_time, 0.25)
+        self.last_time = now
+        self.accumulator += elapsed
+
+        steps = 0
+        while self.accumulator >= self.physics_dt and steps < self.max_steps:
+            self.step()
+            self.accumulator -= self.physics_dt
+            steps += 1
+        if self.accumulator >= self.physics_dt:
+            # Не успеваем - отбрасываем лишнее время, чтобы не уйти в спираль
+            self.dropped_steps += int(self.accumulator / self.physics_dt)
+            self.accumulator %= self.physics_dt
+
+        self.render(self.accumulator / self.physics_dt, elapsed)
+
+class GlowSpriteCache:
+    # Ракетки и мяч со свечением рисуются один раз на размер и цвет
+    MARGIN = 4
+
+    def __init__(self, ratio=1.0):
+        self.ratio = ratio
+        self._sprites = {}
+
+    def _canvas(self, width, height):
+        margin = self.MARGIN
+        sprite = QPixmap(int((width + margin * 2) * self.ratio), int((height + margin * 2) * self.ratio))
+        sprite.setDevicePixelRatio(self.ratio)
+        sprite.fill(Qt.transparent)
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(margin, margin)
+        return sprite, painter
+
+    def paddle(self, width, height, glow, top, bottom, outline):
+        key = ('paddle', width, height, glow.rgba(), top.rgba(), bottom.rgba(), outline.rgba())
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite, painter = self._canvas(width, height)
+            # Свечение
+            for i in range(3, 0, -1):
+                color = QColor(glow)
+                color.setAlpha(100 - i * 30)
+                painter.setBrush(QBrush(color))
+                painter.setPen(Qt.NoPen)
+                painter.drawRoundedRect(-i, -i, width + i*2, height + i*2, 5, 5)
+
+            gradient = QLinearGradient(0, 0, 0, height)
+            gradient.setColorAt(0, top)
+            gradient.setColorAt(1, bottom)
+            painter.setBrush(QBrush(gradient))
+            painter.setPen(QPen(outline, 2))
+            painter.drawRoundedRect(0, 0, width, height, 5, 5)
+            painter.end()
+            self._sprites[key] = sprite
+        return sprite
+
+    def ball(self, size):
+        key = ('ball', size)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite, painter = self._canvas(size, size)
+            # Неоновое свечение мяча
+            for i in range(3, 0, -1):
+                painter.setBrush(QBrush(QColor(255, 255, 255, 100 - i * 30)))
+                painter.setPen(Qt.NoPen)
+                painter.drawEllipse(-i, -i, size + i*2, size + i*2)
+
+            # Основной мяч
+            gradient = QRadialGradient(size / 2, size / 2, size / 2)
+            gradient.setColorAt(0, QColor(255, 255, 255))
+            gradient.setColorAt(1, QColor(200, 200, 255))
+            painter.setBrush(QBrush(gradient))
+            painter.setPen(QPen(QColor(0, 255, 255), 2))
+            painter.drawEllipse(0, 0, size, size)
+            painter.end()
+            self._sprites[key] = sprite
+        return sprite
+
+class GlyphAtlas:
+    # Строки (символы, подписи) один раз отрисованы в общую QImage.
+    # QImage, в отличие от QPixmap, можно рисовать из любого потока.
+    PAD = 3
+
+    def __init__(self, font, color, tokens, ratio=1.0):
+        self.color = color
+        metrics = QFontMetrics(font)
+        self.ascent = metrics.ascent()
+        self.height = metrics.height() + self.PAD * 2
+        self.advances = {token: metrics.horizontalAdvance(token) for token in tokens}
+        self.offsets = {}
+        width = sum(self.advances.values()) + self.PAD * 2 * len(self.advances)
+        self.image = QImage(int(width * ratio), int(self.height * ratio),
+                            QImage.Format_ARGB32_Premultiplied)
+        self.image.setDevicePixelRatio(ratio)
+        self.image.fill(Qt.transparent)
+
+        painter = QPainter(self.image)
+        painter.setFont(font)
+        x = 0
+        for token in self.advances:
+            self.offsets[token] = x
+            self.paint_token(painter, x + self.PAD, self.PAD + self.ascent, token)
+            x += self.advances[token] + self.PAD * 2
+        painter.end()
+
+    def paint_token(self, painter, x, baseline, token):
+        # Стиль символов; подклассы рисуют свой
+        painter.setPen(QPen(self.color, 2))
+        painter.drawText(x, baseline, token)
+
+    def width(self, tokens):
+        return sum(self.advances[token] for token in tokens)
+
+    def draw(self, painter, x, baseline, tokens):
+        # Источник задается в пикселях устройства, приемник - в логических
+        ratio = self.image.devicePixelRatio()
+        for token in tokens:
+            advance = self.advances[token]
+            width = advance + self.PAD * 2
+            painter.drawImage(QRectF(x - self.PAD, baseline - self.ascent - self.PAD, width, self.height),
+                              self.image,
+                              QRectF(self.offsets[token] * ratio, 0, width * ratio, self.height * ratio))
+            x += advance
+
+class ScoreBoard:
+    # Счет собирается из атласа глифов и пересобирается только при изменении
+    SHADOW_DX, SHADOW_DY = -5, -3
+
+    def __init__(self, ratio=1.0):
+        self.ratio = ratio
+        self.font = QFont("Courier New", 24, QFont.Bold)
+        self.tokens = ["P1: ", "P2: "] + list(string.digits)
+        self.shadow = GlyphAtlas(self.font, QColor(0, 0, 0, 150), self.tokens, ratio)
+        self._atlases = {}
+        self._images = {}
+
+    def atlas(self, color):
+        atlas = self._atlases.get(color.rgba())
+        if atlas is None:
+            atlas = GlyphAtlas(self.font, color, self.tokens, ratio=self.ratio)
+            self._atlases[color.rgba()] = atlas
+        return atlas
+
+    def image(self, label, score, color):
+        key = (label, color.rgba())
+        cached = self._images.get(key)
+        if cached is not None and cached[0] == score:
+            return cached[1]
+
+        atlas = self.atlas(color)
+        tokens = [label] + list(str(score))
+        dx, dy = -self.SHADOW_DX, -self.SHADOW_DY
+        width = atlas.width(tokens) + dx + GlyphAtlas.PAD * 2
+        image = QPixmap(int(width * self.ratio), int((atlas.height + dy) * self.ratio))
+        image.setDevicePixelRatio(self.ratio)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        # Тень под всеми символами, затем основной текст
+        baseline = GlyphAtlas.PAD + atlas.ascent
+        self.shadow.draw(painter, GlyphAtlas.PAD, baseline, tokens)
+        atlas.draw(painter, GlyphAtlas.PAD + dx, baseline + dy, tokens)
+        painter.end()
+        self._images[key] = (score, image)
+        return image
+
+    def draw(self, painter, x, baseline, label, score, color):
+        # x, baseline - как у painter.drawText для основного текста
+        image = self.image(label, score, color)
+        painter.drawPixmap(x + self.SHADOW_DX - GlyphAtlas.PAD,
+                           baseline + self.SHADOW_DY - self.shadow.ascent - GlyphAtlas.PAD, image)
+
+class BallTrail:
+    # След мяча в кольцевом буфере и таблица заранее отрисованных кружков затухания
+    LEVELS = 32
+    MAX_SIZE = 12
+
+    def __init__(self, length=10):
+        self.length = length
+        self.xs = np.zeros(length)
+        self.ys = np.zeros(length)
+        self.head = 0
+        self.count = 0
+        self._strip = None
+
+    def __len__(self):
+        return self.count
+
+    def push(self, x, y):
+        self.head = (self.head + 1) % self.length
+        self.xs[self.head] = x
+        self.ys[self.head] = y
+        self.count = min(self.count + 1, self.length)
+
+    def clear(self):
+        self.count = 0
+
+    def ordered(self):
+        # Индексы от новой точки к старой
+        return (self.head - np.arange(self.count)) % self.length
+
+    def bounds(self):
+        order = self.ordered()
+        xs, ys = self.xs[order], self.ys[order]
+        return xs.min(), ys.min(), xs.max(), ys.max()
+
+    def strip(self):
+        if self._strip is None:
+            cell = self.MAX_SIZE + 2
+            self._strip = QPixmap(cell * self.LEVELS, cell)
+            self._strip.fill(Qt.transparent)
+            painter = QPainter(self._strip)
+            painter.setRenderHint(QPainter.Antialiasing)
             painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(particle['x']), int(particle['y']), int(size), int(size))
+            for level in range(1, self.LEVELS):
+                fraction = level / self.LEVELS
+                size = self.MAX_SIZE * fraction
+                cx, cy = level * cell + cell / 2, cell / 2
+                gradient = QRadialGradient(cx, cy, size)
+                gradient.setColorAt(0, QColor(0, 255, 255, int(200 * fraction)))
+                gradient.setColorAt(1, QColor(255, 0, 255, 0))
+                painter.setBrush(QBrush(gradient))
+                painter.drawEllipse(QRectF(cx - size / 2, cy - size / 2, size, size))
+            painter.end()
+        return self._strip
+
+    def draw(self, painter):
+        n = self.count
+        if not n:
+            return
+        # Чем старше точка, тем крупнее и ярче кружок
+        order = self.ordered()
+        levels = (np.arange(n) * self.LEVELS // n).tolist()
+        xs = self.xs[order].tolist()
+        ys = self.ys[order].tolist()
+        cell = self.MAX_SIZE + 2
+        fragments = [QPainter.PixmapFragment.create(QPointF(xs[i], ys[i]),
+                                                    QRectF(levels[i] * cell, 0, cell, cell))
+                     for i in range(n) if levels[i]]
+        painter.drawPixmapFragments(fragments, self.strip())
+
+class FrameProfiler:
+    # Время фаз кадра в наносекундах: последние window замеров для перцентилей
+    # и гистограмма за всю сессию с шагом bucket_ns для сравнения между версиями
+    BUCKET_NS = 50_000
+
+    def __init__(self, window=240, enabled=False, bucket_ns=BUCKET_NS):
+        self.window = window
+        self.enabled = enabled
+        self.bucket_ns = bucket_ns
+        self.samples = {}
+        self.histograms = {}
 
-class SynthwaveCaptchaDialog(QDialog):
+    def begin(self):
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def lap(self, phase, started):
+        if not self.enabled:
+            return 0
+        now = time.perf_counter_ns()
+        self.record(phase, now - started)
+        return now
+
+    def record(self, phase, duration_ns):
+        if not self.enabled:
+            return
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+            self.histograms[phase] = Counter()
+        samples.append(duration_ns)
+        self.histograms[phase][duration_ns // self.bucket_ns] += 1
+
+    def percentiles(self, phase, points=(50, 95, 99)):
+        samples = sorted(self.samples.get(phase, ()))
+        if not samples:
+            return [0.0 for _ in points]
+        return [samples[min(len(samples) - 1, len(samples) * p // 100)] / 1e6 for p in points]
+
+    def session_percentiles(self, phase, points=(50, 95, 99)):
+        # Перцентили по гистограмме за всю сессию, с точностью до bucket_ns
+        histogram = self.histograms.get(phase)
+        if not histogram:
+            return [0.0 for _ in points]
+        total = sum(histogram.values())
+        buckets = sorted(histogram.items())
+        result = []
+        for p in points:
+            rank = min(total - 1, total * p // 100)
+            seen = 0
+            for bucket, count in buckets:
+                seen += count
+                if seen > rank:
+                    result.append(bucket * self.bucket_ns / 1e6)
+                    break
+        return result
+
+    def overlay_lines(self):
+        p50, p95, p99 = self.percentiles('frame')
+        lines = [f"FRAME p50 {p50:.1f} p95 {p95:.1f} p99 {p99:.1f} ms"]
+        for phase in self.samples:
+            if phase != 'frame':
+                lines.append(f"{phase.upper():<10} p95 {self.percentiles(phase, (95,))[0]:6.2f} ms")
+        return lines
+
+    def dump(self, path):
+        report = {}
+        for phase, histogram in self.histograms.items():
+            p50, p95, p99 = self.percentiles(phase)
+            report[phase] = {
+                'bucket_us': self.bucket_ns / 1000,
+                'count': sum(histogram.values()),
+                'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+                'histogram': {str(bucket): count for bucket, count in sorted(histogram.items())},
+            }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+class CaptchaGlyphAtlas(GlyphAtlas):
+    # Символы капчи со свечением и градиентом. Атласы создаются из потока пула,
+    # поэтому общий кэш под блокировкой.
+    _cache = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, family, size):
+        with cls._lock:
+            atlas = cls._cache.get((family, size))
+            if atlas is None:
+                atlas = cls._cache[(family, size)] = cls(QFont(family, size, QFont.Bold),
+                                                         QColor(255, 0, 255), CaptchaFactory.ALPHABET)
+            return atlas
+
+    def paint_token(self, painter, x, baseline, token):
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Внешнее свечение
+        glow = QColor(self.color)
+        for glow_size in range(10, 0, -2):
+            glow.setAlpha(20 + glow_size * 5)
+            painter.setPen(QPen(glow, glow_size))
+            painter.drawText(x, baseline, token)
+        # Основной текст с градиентом: от 20 px над базовой линией до 10 px под ней
+        gradient = QLinearGradient(0, baseline - 20, 0, baseline + 10)
+        gradient.setColorAt(0, QColor(255, 255, 255))
+        gradient.setColorAt(0.5, QColor(0, 255, 255))
+        gradient.setColorAt(1, QColor(255, 0, 255))
+        painter.setPen(QPen(gradient, 3))
+        painter.drawText(x, baseline, token)
+
+class CaptchaRenderer(QRunnable):
+    # Рисует одну капчу в потоке пула; QImage и QPainter по нему потокобезопасны
+    def __init__(self, factory, text, scan_y):
+        super().__init__()
+        self.factory = factory
+        self.text = text
+        self.scan_y = scan_y
+
+    def run(self):
+        self.factory.rendered.emit(self.text, CaptchaFactory.render(self.text, self.scan_y))
+
+class CaptchaFactory(QObject):
+    # Держит несколько заранее отрисованных капч, чтобы диалог открывался мгновенно.
+    # Картинки рисуются в фоновом потоке, готовые приходят сигналом в поток интерфейса.
+    ALPHABET = string.ascii_uppercase + string.digits
+    LENGTH = 6
+    POOL_SIZE = 4
+    WIDTH, HEIGHT = 300, 100
+    FONT_FAMILY, FONT_SIZE = "Courier New", 32
+    _instance = None
+    _background = None
+    _lock = threading.Lock()
+
+    rendered = pyqtSignal(str, QImage)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.ready = deque()
+        self.pending = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.rendered.connect(self.store)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.pool.waitForDone)
+
+    def new_captcha(self):
+        # Текст и шум выбираются здесь, чтобы глобальный random трогал только один поток
+        return ''.join(random.choices(self.ALPHABET, k=self.LENGTH)), random.randrange(self.HEIGHT)
+
+    def refill(self):
+        while len(self.ready) + self.pending < self.POOL_SIZE:
+            self.pending += 1
+            self.pool.start(CaptchaRenderer(self, *self.new_captcha()))
+
+    def store(self, text, image):
+        self.pending -= 1
+        self.ready.append((text, image))
+
+    def take(self):
+        # Если пул пуст (первый запуск или серия ошибок), рисуем сразу
+        if self.ready:
+            text, image = self.ready.popleft()
+        else:
+            text, scan_y = self.new_captcha()
+            image = self.render(text, scan_y)
+        self.refill()
+        return text, image
+
+    @classmethod
+    def background(cls):
+        # Сетка и градиент одинаковы у всех капч - рисуются один раз
+        with cls._lock:
+            if cls._background is None:
+                image = QImage(cls.WIDTH, cls.HEIGHT, QImage.Format_ARGB32_Premultiplied)
+                image.fill(Qt.transparent)
+                painter = QPainter(image)
+                painter.setRenderHint(QPainter.Antialiasing)
+                
+                # Фон с сеткой
+                painter.setPen(QPen(QColor(255, 0, 255, 30), 1))
+                for x in range(0, cls.WIDTH, 10):
+                    for y in range(0, cls.HEIGHT, 10):
+                        if (x + y) % 20 == 0:
+                            painter.drawPoint(x, y)
+                
+                # Градиентный фон
+                gradient = QLinearGradient(0, 0, cls.WIDTH, cls.HEIGHT)
+                gradient.setColorAt(0, QColor(255, 0, 255, 50))
+                gradient.setColorAt(0.5, QColor(0, 255, 255, 50))
+                gradient.setColorAt(1, QColor(255, 0, 255, 50))
+                painter.fillRect(0, 0, cls.WIDTH, cls.HEIGHT, gradient)
+                painter.end()
+                cls._background = image
+            return cls._background
+
+    @classmethod
+    def render(cls, text, scan_y):
+        # Капча - это копия фона, готовые символы из атласа и линия сканирования
+        image = cls.background().copy()
+        glyphs = CaptchaGlyphAtlas.get(cls.FONT_FAMILY, cls.FONT_SIZE)
+        painter = QPainter(image)
+        painter.setPen(QPen(QColor(0, 255, 255, 100), 2))
+        for i, char in enumerate(text):
+            glyphs.draw(painter, 30 + i * 40, 60, char)
+            # Эффект сканирования
+            painter.drawLine(25 + i * 40, scan_y, 55 + i * 40, scan_y)
+        painter.end()
+        return image
+
+class AuthTask(QRunnable):
+    # Проверка или регистрация в потоке пула; результат уходит сигналом
+    def __init__(self, service, action, key, username, password):
+        super().__init__()
+        self.service = service
+        self.action = action
+        self.key = key
+        self.username = username
+        self.password = password
+
+    def run(self):
+        try:
+            ok = bool(getattr(self.service.store, self.action)(self.username, self.password))
+        except Exception as error:
+            # Сбой базы - не неверный пароль: в счетчик ошибок входа не попадает
+            self.service.failed.emit(self.action, self.username, f"{type(error).__name__}: {error}")
+            return
+        self.service.task_done.emit(self.action, self.key, self.username, ok)
+
+class AuthService(QObject):
+    # Проверка паролей без блокировки интерфейса. Хэширование идет в QThreadPool,
+    # результат приходит сигналами verified/registered в поток интерфейса,
+    # а ошибки самого хранилища - отдельным сигналом failed.
+    # Недавние успешные входы запоминаются на CACHE_TTL секунд, а подбор пароля
+    # упирается в LoginThrottle: заблокированное имя или имя, для которого нужна
+    # капча, даже не доходит до хэширования и кэша.
+    CACHE_TTL = 300
+    CACHE_SIZE = 64
+    _instance = None
+
+    verified = pyqtSignal(str, bool)
+    registered = pyqtSignal(str, bool)
+    throttled = pyqtSignal(str, float)
+    captcha_required = pyqtSignal(str)
+    failed = pyqtSignal(str, str, str)
+    task_done = pyqtSignal(str, bytes, str, bool)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(UserStore(os.environ.get('PONG_USERS_DB', 'pong_users.db')))
+        return cls._instance
+
+    def __init__(self, store, workers=2, throttle=None):
+        super().__init__()
+        self.store = store
+        self.throttle = throttle or LoginThrottle()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(workers)
+        # Ключ кэша - HMAC от имени и пароля со случайным ключом процесса,
+        # чтобы пароли не лежали в памяти открытым текстом
+        self.secret = os.urandom(32)
+        self.cache = OrderedDict()
+        self.task_done.connect(self.on_task_done)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    def cache_key(self, username, password):
+        return hmac.new(self.secret, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
+    def cached(self, key):
+        expires = self.cache.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self.cache[key]
+            return False
+        return True
+
+    def verify(self, username, password):
+        delay = self.throttle.retry_after(username)
+        if delay > 0:
+            self.throttled.emit(username, delay)
+            return
+        if self.throttle.needs_captcha(username):
+            self.captcha_required.emit(username)
+            return
+        key = self.cache_key(username, password)
+        if self.cached(key):
+            self.throttle.record_success(username)
+            self.verified.emit(username, True)
+            return
+        self.pool.start(AuthTask(self, 'verify', key, username, password))
+
+    def register(self, username, password):
+        self.pool.start(AuthTask(self, 'register', b'', username, password))
+
+    def on_task_done(self, action, key, username, ok):
+        if action == 'register':
+            self.registered.emit(username, ok)
+            return
+        if ok:
+            self.throttle.record_success(username)
+            self.cache[key] = time.monotonic() + self.CACHE_TTL
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.throttle.record_failure(username)
+        self.verified.emit(username, ok)
+
+    def close(self):
+        self.pool.waitForDone()
+        self.store.close()
+
+class SynthwaveCaptchaDialog(AnimationLifecycle, QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("⚡ SYNTHWAVE VERIFICATION ⚡")
@@ -130,8 +1170,8 @@ class SynthwaveCaptchaDialog(QDialog):
                 border: 1px solid #00ffff;
             }
         """)
-        self.captcha_text = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        self.particles = ParticleSystem()
+        self.captcha_text = ''
+        self.particles = ParticleSystem(target_frame_time=0.05)
         self.init_ui()
         self.setup_animations()
 
@@ -187,9 +1227,10 @@ class SynthwaveCaptchaDialog(QDialog):
 
     def setup_animations(self):
         # Анимация частиц
-        self.particle_timer = QTimer()
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(50)
+        self.particle_timer = AnimationClock.instance().subscribe(self, self.update_particles, 50)
+        self.particle_timer.start()
+        # Закрытие диалога только прячет его - освобождаем анимации сами
+        self.finished.connect(self.release_animations)
 
     def update_particles(self):
         # Добавляет частицы по краям текста
@@ -212,84 +1253,44 @@ class SynthwaveCaptchaDialog(QDialog):
         self.particles.draw(painter)
 
     def generate_synthwave_captcha(self):
-        image = QImage(300, 100, QImage.Format_ARGB32)
-        image.fill(Qt.transparent)
-        
-        painter = QPainter(image)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Фон с сеткой
-        for x in range(0, 300, 10):
-            for y in range(0, 100, 10):
-                if (x + y) % 20 == 0:
-                    painter.setPen(QPen(QColor(255, 0, 255, 30), 1))
-                    painter.drawPoint(x, y)
-        
-        # Анимированный градиентный фон
-        time = QTimer().remainingTime() / 1000.0
-        gradient = QLinearGradient(0, 0, 300, 100)
-        gradient.setColorAt(0, QColor(255, 0, 255, 50))
-        gradient.setColorAt(0.5, QColor(0, 255, 255, 50))
-        gradient.setColorAt(1, QColor(255, 0, 255, 50))
-        painter.fillRect(0, 0, 300, 100, gradient)
-        
-        # Текст с множественным свечением
-        font = QFont("Courier New", 32, QFont.Bold)
-        painter.setFont(font)
-        
-        for i, char in enumerate(self.captcha_text):
-            # Внешнее свечение
-            for glow_size in range(10, 0, -2):
-                alpha = 20 + glow_size * 5
-                painter.setPen(QPen(QColor(255, 0, 255, alpha), glow_size))
-                painter.drawText(30 + i * 40, 60, char)
-            
-            # Основной текст с градиентом
-            char_gradient = QLinearGradient(30 + i * 40, 40, 30 + i * 40, 70)
-            char_gradient.setColorAt(0, QColor(255, 255, 255))
-            char_gradient.setColorAt(0.5, QColor(0, 255, 255))
-            char_gradient.setColorAt(1, QColor(255, 0, 255))
-            painter.setPen(QPen(char_gradient, 3))
-            painter.drawText(30 + i * 40, 60, char)
-            
-            # Эффект сканирования
-            scan_y = (QTimer().remainingTime() // 10) % 100
-            painter.setPen(QPen(QColor(0, 255, 255, 100), 2))
-            painter.drawLine(25 + i * 40, scan_y, 55 + i * 40, scan_y)
-
-        painter.end()
-        pixmap = QPixmap.fromImage(image)
-        self.captcha_label.setPixmap(pixmap)
+        # Готовая картинка из пула фабрики - без отрисовки в потоке интерфейса
+        self.captcha_text, image = CaptchaFactory.instance().take()
+        self.captcha_label.setPixmap(QPixmap.fromImage(image))
 
     def refresh_captcha(self):
-        self.captcha_text = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
         self.generate_synthwave_captcha()
         self.input.clear()
         # Эффект частиц при обновлении
-        for _ in range(20):
-            self.particles.add_particle(150, 50, QColor(0, 255, 255), 30)
+        self.particles.add_burst(150, 50, QColor(0, 255, 255), 20, 30)
 
     def verify_captcha(self):
         if self.input.text().upper() == self.captcha_text:
             # Эффект успеха
-            for _ in range(50):
-                self.particles.add_particle(200, 200, QColor(0, 255, 0), 60)
+            self.particles.add_burst(200, 200, QColor(0, 255, 0), 50, 60)
             QTimer.singleShot(500, self.accept)
         else:
             # Эффект ошибки
-            for _ in range(50):
-                self.particles.add_particle(200, 200, QColor(255, 0, 0), 60)
+            self.particles.add_burst(200, 200, QColor(255, 0, 0), 50, 60)
             QMessageBox.warning(self, "⛔ ACCESS DENIED", "❌ INVALID CAPTCHA CODE!")
             self.refresh_captcha()
 
-class SynthwaveLoginWindow(QMainWindow):
+class SynthwaveLoginWindow(AnimationLifecycle, QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("💾 SYNTHWAVE TERMINAL v3.0")
-        self.users = {"admin": "password123", "user": "123456", "player": "pong2024"}
-        self.particles = ParticleSystem()
+        # Сервис общий для всех окон входа; ответы ждет только окно, отправившее запрос
+        self.auth = AuthService.instance()
+        self.pending = None
+        self.auth.verified.connect(self.on_login_checked)
+        self.auth.throttled.connect(self.on_login_throttled)
+        self.auth.captcha_required.connect(self.on_captcha_required)
+        self.auth.failed.connect(self.on_auth_failed)
+        self.auth.registered.connect(self.on_registration_done)
+        self.particles = ParticleSystem(target_frame_time=0.03)
         self.init_ui()
         self.setup_animations()
+        # Капчи рисуются в фоне, пока игрок вводит логин
+        CaptchaFactory.instance().refill()
 
     def init_ui(self):
         self.central_widget = QWidget()
@@ -399,9 +1400,8 @@ class SynthwaveLoginWindow(QMainWindow):
 
     def setup_animations(self):
         # Таймер для частиц
-        self.particle_timer = QTimer()
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(30)
+        self.particle_timer = AnimationClock.instance().subscribe(self, self.update_particles, 30)
+        self.particle_timer.start()
 
     def update_particles(self):
         # Создает частицы по краям окна
@@ -423,50 +1423,106 @@ class SynthwaveLoginWindow(QMainWindow):
     def login(self):
         username = self.username_input.text()
         password = self.password_input.text()
+        # Хэширование медленное - проверяем в фоне, кнопки ждут ответа
+        self.set_busy(('login', username))
+        self.status_label.setText(">>> VERIFYING... <<<")
+        self.auth.verify(username, password)
+
+    def set_busy(self, pending):
+        self.pending = pending
+        self.login_button.setEnabled(pending is None)
+        self.register_button.setEnabled(pending is None)
 
-        if username in self.users and self.users[username] == password:
+    def on_login_checked(self, username, ok):
+        if self.pending != ('login', username):
+            return
+        self.set_busy(None)
+        if ok:
             self.status_label.setText(">>> ACCESS GRANTED <<<")
             # Вывод успешного входа
-            for _ in range(100):
-                self.particles.add_particle(300, 275, QColor(0, 255, 0), 80)
+            self.particles.add_burst(300, 275, QColor(0, 255, 0), 100, 80)
             QTimer.singleShot(1000, self.start_game)
+        elif not self.auth.throttle.needs_captcha(username):
+            # Первые ошибки - просто отказ, капча только после нескольких подряд
+            self.status_label.setText(">>> ACCESS DENIED <<<")
+            self.particles.add_burst(300, 275, QColor(255, 0, 0), 50, 60)
         else:
-            self.status_label.setText(">>> ACCESS DENIED - CAPTCHA REQUIRED <<<")
             # Вывод ошибки
-            for _ in range(50):
-                self.particles.add_particle(300, 275, QColor(255, 0, 0), 60)
-            captcha_dialog = SynthwaveCaptchaDialog(self)
-            if captcha_dialog.exec_():
-                self.status_label.setText(">>> INVALID CREDENTIALS <<<")
+            self.particles.add_burst(300, 275, QColor(255, 0, 0), 50, 60)
+            self.open_captcha(username)
+
+    def on_captcha_required(self, username):
+        # Сервис не примет пароль, пока капча для этого имени не решена
+        if self.pending != ('login', username):
+            return
+        self.set_busy(None)
+        self.open_captcha(username)
+
+    def open_captcha(self, username):
+        self.status_label.setText(">>> ACCESS DENIED - CAPTCHA REQUIRED <<<")
+        captcha_dialog = SynthwaveCaptchaDialog(self)
+        # Удаляем диалог после закрытия, чтобы они не копились
+        captcha_dialog.finished.connect(captcha_dialog.deleteLater)
+        captcha_dialog.accepted.connect(lambda: self.on_captcha_passed(username))
+        # Модальный, но без вложенного цикла событий внутри обработчика
+        captcha_dialog.open()
+
+    def on_captcha_passed(self, username):
+        self.auth.throttle.captcha_passed(username)
+        self.status_label.setText(">>> CAPTCHA OK - TRY AGAIN <<<")
+
+    def on_auth_failed(self, action, username, message):
+        if self.pending != (action if action == 'register' else 'login', username):
+            return
+        self.set_busy(None)
+        self.status_label.setText(">>> DATABASE ERROR - TRY AGAIN LATER <<<")
+        QMessageBox.warning(self, "❌ ERROR", f"💾 USER DATABASE ERROR!\n{message}")
+
+    def on_login_throttled(self, username, delay):
+        if self.pending != ('login', username):
+            return
+        self.set_busy(None)
+        self.status_label.setText(f">>> TOO MANY ATTEMPTS - RETRY IN {math.ceil(delay)}S <<<")
 
     def register(self):
         username = self.username_input.text()
         password = self.password_input.text()
         if username and password:
-            if username not in self.users:
-                self.users[username] = password
-                self.status_label.setText(">>> USER REGISTERED <<<")
-                # Вывод регистрации
-                for _ in range(80):
-                    self.particles.add_particle(300, 275, QColor(255, 255, 0), 70)
-                QMessageBox.information(self, "✅ SUCCESS", "🎉 USER REGISTRATION COMPLETE!")
-            else:
-                self.status_label.setText(">>> USER ALREADY EXISTS <<<")
-                QMessageBox.warning(self, "❌ ERROR", "⚠️ USER ALREADY EXISTS IN DATABASE!")
+            self.set_busy(('register', username))
+            self.status_label.setText(">>> REGISTERING... <<<")
+            self.auth.register(username, password)
         else:
             self.status_label.setText(">>> FILL ALL FIELDS <<<")
             QMessageBox.warning(self, "❌ ERROR", "📝 PLEASE FILL ALL FIELDS!")
 
+    def on_registration_done(self, username, ok):
+        if self.pending != ('register', username):
+            return
+        self.set_busy(None)
+        if ok:
+            self.status_label.setText(">>> USER REGISTERED <<<")
+            # Вывод регистрации
+            self.particles.add_burst(300, 275, QColor(255, 255, 0), 80, 70)
+            QMessageBox.information(self, "✅ SUCCESS", "🎉 USER REGISTRATION COMPLETE!")
+        else:
+            self.status_label.setText(">>> USER ALREADY EXISTS <<<")
+            QMessageBox.warning(self, "❌ ERROR", "⚠️ USER ALREADY EXISTS IN DATABASE!")
+
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        # Закрытое окно больше не реагирует на ответы сервиса
+        self.set_busy(None)
+
     def start_game(self):
         self.game_window = SynthwavePongGame()
         self.game_window.show()
         self.close()
 
-class SynthwaveMenuWindow(QMainWindow):
+class SynthwaveMenuWindow(AnimationLifecycle, QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("🎮 SYNTHWAVE PONG - MAINFRAME")
-        self.particles = ParticleSystem()
+        self.particles = ParticleSystem(target_frame_time=0.04)
         self.init_ui()
         self.setup_animations()
 
@@ -547,19 +1603,20 @@ class SynthwaveMenuWindow(QMainWindow):
 
     def setup_animations(self):
         # Анимация частиц
-        self.particle_timer = QTimer()
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(40)
+        self.particle_timer = AnimationClock.instance().subscribe(self, self.update_particles, 40)
+        self.particle_timer.start()
         
         # Анимация мигания заголовка
-        self.blink_animation = QPropertyAnimation(self, b"windowTitle")
-        self.blink_animation.setDuration(2000)
-        self.blink_animation.setLoopCount(-1)
-        self.blink_animation.setKeyValueAt(0, "🎮 SYNTHWAVE PONG - MAINFRAME")
-        self.blink_animation.setKeyValueAt(0.5, "🎮 SYNTHWAVE PONG - MAINFRAME _")
-        self.blink_animation.setKeyValueAt(1, "🎮 SYNTHWAVE PONG - MAINFRAME")
+        self.blink_animation = AnimationClock.instance().subscribe(self, self.blink_title, 1000)
         self.blink_animation.start()
 
+    def animation_timers(self):
+        return [self.particle_timer, self.blink_animation]
+
+    def blink_title(self):
+        title = "🎮 SYNTHWAVE PONG - MAINFRAME"
+        self.setWindowTitle(title if self.windowTitle().endswith("_") else title + " _")
+
     def update_particles(self):
         # Создает частицы по всему экрану
         if random.random() > 0.6:
@@ -603,29 +1660,57 @@ class SynthwavePongGame(QMainWindow):
     def keyReleaseEvent(self, event):
         self.game_widget.keyReleaseEvent(event)
 
-class SynthwaveGameWidget(QWidget):
-    def __init__(self, parent=None):
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        self.game_widget.release_animations()
+
+class SynthwaveGameWidget(AnimationLifecycle, QWidget):
+    PROFILER_RECT = QRect(496, 396, 300, 200)
+
+    def __init__(self, parent=None, physics_hz=120, render_hz=60, trail_length=10):
         super().__init__(parent)
-        self._ball_x, self._ball_y = 400, 300
-        self._ball_dx, self._ball_dy = 6, 6
-        self._paddle1_y, self._paddle2_y = 250, 250
-        self.paddle_height, self.paddle_width = 100, 15
-        self._score1, self._score2 = 0, 0
+        # Правила и состояние игры живут в движке без Qt
+        self.engine = PongEngine(physics_hz)
+        (self.render_ball_x, self.render_ball_y,
+         self.render_paddle1_y, self.render_paddle2_y) = self.engine.interpolate(1.0)
         self.move_up1 = False
         self.move_down1 = False
         self.move_up2 = False
         self.move_down2 = False
+        # Компьютер за правую ракетку (клавиша C переключает сложность)
+        self.cpu_opponent = None
+        # Перерисовываем только изменившиеся области, фоновые анимации - раз в ambient_interval кадров
+        self.dirty_rects = True
+        self.ambient_interval = 4
+        self._frame_count = 0
+        self._ambient_dt = 0.0
+        self._damage = QRegion()
+        self._damage_score = None
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        # Замеры фаз кадра: F3 - оверлей, F4 - сохранить гистограммы
+        self.profiler = FrameProfiler(enabled=os.environ.get('PONG_PROFILE') == '1')
         
-        self.particles = ParticleSystem()
-        self.trail_positions = []
+        self.particles = ParticleSystem(target_frame_time=1 / render_hz)
+        self.trail = BallTrail(trail_length)
         self.horizontal_lines = [(i * 25, random.randint(50, 150)) for i in range(32)]
         self.mountain_points = self.generate_mountains()
+        self._static_layer = None
+        self.starfield = Starfield()
+        self.sprites = GlowSpriteCache(self.devicePixelRatioF())
+        self.scoreboard = ScoreBoard(self.devicePixelRatioF())
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_game)
-        self.timer.start(16)
+        self.loop = GameLoop(self, self.step_physics, self.render_frame, physics_hz, render_hz)
+        self.loop.start()
         self.setFocusPolicy(Qt.StrongFocus)
 
+    @property
+    def paddle_height(self):
+        return self.engine.paddle_height
+
+    @property
+    def paddle_width(self):
+        return self.engine.paddle_width
+
     def generate_mountains(self):
         points = []
         for x in range(0, 800, 10):
@@ -633,33 +1718,103 @@ class SynthwaveGameWidget(QWidget):
             points.append((x, y))
         return points
 
+    def static_layer(self):
+        # Неизменные слои (градиент, горы, солнце) рисуются один раз в кэш
+        ratio = self.devicePixelRatioF()
+        if self._static_layer is None or self._static_layer.size() != self.size() * ratio:
+            layer = QPixmap(self.size() * ratio)
+            layer.setDevicePixelRatio(ratio)
+            layer.fill(Qt.black)
+            painter = QPainter(layer)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.draw_advanced_background(painter)
+            self.draw_mountains(painter)
+            self.draw_sun(painter)
+            painter.end()
+            self._static_layer = layer
+        return self._static_layer
+
+    def invalidate_static_layer(self):
+        # Кэш фона пересобирается на следующем кадре
+        self._static_layer = None
+        self.update()
+
+    def changeEvent(self, event):
+        # Смена палитры или стиля (темы) - фон перерисовывается
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self.invalidate_static_layer()
+        super().changeEvent(event)
+
+    def resizeEvent(self, event):
+        self._static_layer = None
+        super().resizeEvent(event)
+
+    def animation_timers(self):
+        return [self.loop.timer]
+
+    def resume_animations(self):
+        # start() сбрасывает last_time - после паузы нет рывка физики
+        self.particles.reset_timing()
+        self.loop.start()
+
+    def release_animations(self):
+        super().release_animations()
+        self.trail.clear()
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Отрисовывает синтвейв фон
-        self.draw_advanced_background(painter)
+        profiler = self.profiler
+        started = t = profiler.begin()
+
+        # Фон, горы и солнце из кэша
+        painter.drawPixmap(0, 0, self.static_layer())
+        t = profiler.lap('background', t)
         
-        # Горы
-        self.draw_mountains(painter)
+        # Звезды
+        self.draw_stars(painter)
+        t = profiler.lap('stars', t)
         
-        # Солнце и лучи
-        self.draw_sun(painter)
+        # Лучи
+        self.draw_rays(painter)
+        t = profiler.lap('rays', t)
         
         # След от мяча
         self.draw_ball_trail(painter)
+        t = profiler.lap('trail', t)
         
         # Ракетки
         self.draw_paddles(painter)
+        t = profiler.lap('paddles', t)
         
         # Мяч
         self.draw_ball(painter)
+        t = profiler.lap('ball', t)
         
         # Счет
         self.draw_score(painter)
+        t = profiler.lap('score', t)
         
         # Частицы
         self.particles.draw(painter)
+        t = profiler.lap('particles', t)
+        profiler.lap('paint', started)
+
+        if profiler.enabled:
+            self.draw_profiler_overlay(painter)
+
+    def draw_profiler_overlay(self, painter):
+        lines = self.profiler.overlay_lines()
+        lines.append(f"PARTICLES {len(self.particles)}  LOD {self.particles.lod:.2f}  "
+                     f"DROPPED {self.loop.dropped_steps}")
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(QColor(0, 0, 0, 170)))
+        painter.drawRect(self.PROFILER_RECT)
+        painter.setFont(QFont("Courier New", 9))
+        painter.setPen(QColor(0, 255, 0))
+        for i, line in enumerate(lines):
+            painter.drawText(self.PROFILER_RECT.x() + 6, self.PROFILER_RECT.y() + 14 + i * 13, line)
 
     def draw_advanced_background(self, painter):
         # Градиент
@@ -669,14 +1824,9 @@ class SynthwaveGameWidget(QWidget):
         gradient.setColorAt(0.6, QColor(50, 0, 70))
         gradient.setColorAt(1, QColor(0, 0, 0))
         painter.fillRect(0, 0, 800, 600, gradient)
-        
-        # Звезды
-        painter.setPen(QPen(Qt.white, 1))
-        for _ in range(100):
-            x = random.randint(0, 800)
-            y = random.randint(0, 300)
-            size = random.randint(1, 3)
-            painter.drawEllipse(x, y, size, size)
+
+    def draw_stars(self, painter):
+        self.starfield.draw(painter)
 
     def draw_mountains(self, painter):
         path = QPainterPath()
@@ -699,150 +1849,123 @@ class SynthwaveGameWidget(QWidget):
         painter.setBrush(QBrush(sun_gradient))
         painter.setPen(Qt.NoPen)
         painter.drawEllipse(0, 400, 800, 800)
-        
-        # Лучи
+
+    def draw_rays(self, painter):
         painter.setPen(QPen(QColor(0, 255, 255, 60), 2))
         for x, alpha in self.horizontal_lines:
             painter.setPen(QPen(QColor(0, 255, 255, alpha), 2))
             painter.drawLine(x, 600, x, 200)
 
     def draw_ball_trail(self, painter):
-        for i, (x, y) in enumerate(self.trail_positions):
-            alpha = 200 * (i / len(self.trail_positions))
-            size = 12 * (i / len(self.trail_positions))
-            gradient = QRadialGradient(x, y, size)
-            gradient.setColorAt(0, QColor(0, 255, 255, int(alpha)))
-            gradient.setColorAt(1, QColor(255, 0, 255, 0))
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(x - size/2), int(y - size/2), int(size), int(size))
+        self.trail.draw(painter)
 
     def draw_paddles(self, painter):
-        # Левая ракетка с свечением
-        for i in range(3, 0, -1):
-            alpha = 100 - i * 30
-            painter.setBrush(QBrush(QColor(255, 0, 255, alpha)))
-            painter.setPen(Qt.NoPen)
-            painter.drawRoundedRect(50 - i, int(self._paddle1_y) - i, 
-                                  self.paddle_width + i*2, self.paddle_height + i*2, 5, 5)
-        
-        paddle_gradient = QLinearGradient(50, self._paddle1_y, 50, self._paddle1_y + self.paddle_height)
-        paddle_gradient.setColorAt(0, QColor(255, 0, 255))
-        paddle_gradient.setColorAt(1, QColor(128, 0, 255))
-        painter.setBrush(QBrush(paddle_gradient))
-        painter.setPen(QPen(QColor(255, 100, 255), 2))
-        painter.drawRoundedRect(50, int(self._paddle1_y), self.paddle_width, self.paddle_height, 5, 5)
-        
-        # Правая ракетка с свечением
-        for i in range(3, 0, -1):
-            alpha = 100 - i * 30
-            painter.setBrush(QBrush(QColor(0, 255, 255, alpha)))
-            painter.setPen(Qt.NoPen)
-            painter.drawRoundedRect(740 - i, int(self._paddle2_y) - i, 
-                                  self.paddle_width + i*2, self.paddle_height + i*2, 5, 5)
-        
-        paddle_gradient2 = QLinearGradient(740, self._paddle2_y, 740, self._paddle2_y + self.paddle_height)
-        paddle_gradient2.setColorAt(0, QColor(0, 255, 255))
-        paddle_gradient2.setColorAt(1, QColor(0, 128, 255))
-        painter.setBrush(QBrush(paddle_gradient2))
-        painter.setPen(QPen(QColor(100, 255, 255), 2))
-        painter.drawRoundedRect(740, int(self._paddle2_y), self.paddle_width, self.paddle_height, 5, 5)
+        # Ракетки со свечением из кэша спрайтов
+        margin = GlowSpriteCache.MARGIN
+        left = self.sprites.paddle(self.paddle_width, self.paddle_height, QColor(255, 0, 255),
+                                   QColor(255, 0, 255), QColor(128, 0, 255), QColor(255, 100, 255))
+        right = self.sprites.paddle(self.paddle_width, self.paddle_height, QColor(0, 255, 255),
+                                    QColor(0, 255, 255), QColor(0, 128, 255), QColor(100, 255, 255))
+        painter.drawPixmap(50 - margin, int(self.render_paddle1_y) - margin, left)
+        painter.drawPixmap(740 - margin, int(self.render_paddle2_y) - margin, right)
 
     def draw_ball(self, painter):
-        # Неоновое свечение мяча
-        for i in range(3, 0, -1):
-            alpha = 100 - i * 30
-            painter.setBrush(QBrush(QColor(255, 255, 255, alpha)))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(self._ball_x) - i, int(self._ball_y) - i, 10 + i*2, 10 + i*2)
-        
-        # Основной мяч
-        ball_gradient = QRadialGradient(self._ball_x + 5, self._ball_y + 5, 5)
-        ball_gradient.setColorAt(0, QColor(255, 255, 255))
-        ball_gradient.setColorAt(1, QColor(200, 200, 255))
-        painter.setBrush(QBrush(ball_gradient))
-        painter.setPen(QPen(QColor(0, 255, 255), 2))
-        painter.drawEllipse(int(self._ball_x), int(self._ball_y), 10, 10)
+        margin = GlowSpriteCache.MARGIN
+        painter.drawPixmap(int(self.render_ball_x) - margin, int(self.render_ball_y) - margin,
+                           self.sprites.ball(10))
 
     def draw_score(self, painter):
-        painter.setFont(QFont("Courier New", 24, QFont.Bold))
-        
-        # Тень
-        painter.setPen(QPen(QColor(0, 0, 0, 150), 4))
-        painter.drawText(195, 47, f"P1: {self._score1}")
-        painter.drawText(545, 47, f"P2: {self._score2}")
-        
-        # Основной текст
-        painter.setPen(QPen(QColor(255, 0, 255), 2))
-        painter.drawText(200, 50, f"P1: {self._score1}")
-        painter.setPen(QPen(QColor(0, 255, 255), 2))
-        painter.drawText(550, 50, f"P2: {self._score2}")
+        self.scoreboard.draw(painter, 200, 50, "P1: ", self.engine.score1, QColor(255, 0, 255))
+        self.scoreboard.draw(painter, 550, 50, "P2: ", self.engine.score2, QColor(0, 255, 255))
 
-    def update_game(self):
-        # Обновляет анимации
-        self.horizontal_lines = [(pos, (alpha + random.randint(-3, 3)) % 150) 
-                               for pos, alpha in self.horizontal_lines]
+    def step_physics(self):
+        started = self.profiler.begin()
+        if self.cpu_opponent is not None:
+            move2 = self.cpu_opponent.move(self.engine, 2)
+        else:
+            move2 = self.move_down2 - self.move_up2
+        inputs = (self.move_down1 - self.move_up1, move2)
+        for contact in self.engine.step(inputs):
+            if contact.surface in ('top_wall', 'bottom_wall'):
+                # Эффект отскока
+                self.particles.add_burst(contact.x, contact.y, QColor(255, 255, 0), 10, 30)
+            elif contact.surface == 'left_paddle':
+                # Эффект отскока от ракетки
+                self.particles.add_burst(contact.x, contact.y, QColor(255, 0, 255), 15, 40)
+            elif contact.surface == 'right_paddle':
+                self.particles.add_burst(contact.x, contact.y, QColor(0, 255, 255), 15, 40)
+            else:
+                # Гол - движок уже сбросил мяч
+                self.on_ball_reset()
+        self.profiler.lap('physics', started)
+
+    def render_frame(self, blend, elapsed):
+        started = self.profiler.begin()
+        # Интерполяция между двумя последними шагами физики
+        (self.render_ball_x, self.render_ball_y,
+         self.render_paddle1_y, self.render_paddle2_y) = self.engine.interpolate(blend)
+        frame_dt = elapsed * 60
+        self._frame_count += 1
+        self._ambient_dt += frame_dt
+        ambient = not self.dirty_rects or self._frame_count % self.ambient_interval == 0
+
+        # Обновляет анимации (они занимают весь экран, поэтому только в полных кадрах)
+        if ambient:
+            self.horizontal_lines = [(pos, (alpha + random.randint(-3, 3)) % 150) 
+                                   for pos, alpha in self.horizontal_lines]
+            self.starfield.advance(self._ambient_dt)
+            self._ambient_dt = 0.0
         
         # След мяча
-        self.trail_positions.insert(0, (self._ball_x + 5, self._ball_y + 5))
-        if len(self.trail_positions) > 10:
-            self.trail_positions.pop()
+        self.trail.push(self.render_ball_x + 5, self.render_ball_y + 5)
         
         # Добавляет частицы при движении
         if random.random() > 0.5:
-            self.particles.add_particle(self._ball_x + 5, self._ball_y + 5, 
+            self.particles.add_particle(self.render_ball_x + 5, self.render_ball_y + 5, 
                                       random.choice([QColor(255, 0, 255), QColor(0, 255, 255)]), 20)
-        
-        # Движение мяча
-        self._ball_x += self._ball_dx
-        self._ball_y += self._ball_dy
-
-        # Отскок от границ
-        if self._ball_y <= 0 or self._ball_y >= 590:
-            self._ball_dy *= -1
-            # Эффект отскока
-            for _ in range(10):
-                self.particles.add_particle(self._ball_x, self._ball_y, QColor(255, 255, 0), 30)
-
-        # Отскок от ракеток
-        if (self._ball_x <= 65 and self._paddle1_y <= self._ball_y <= self._paddle1_y + self.paddle_height) or \
-           (self._ball_x >= 725 and self._paddle2_y <= self._ball_y <= self._paddle2_y + self.paddle_height):
-            self._ball_dx *= -1.05  # Ускорение после отскока
-            # Эффект отскока от ракетки
-            for _ in range(15):
-                self.particles.add_particle(self._ball_x, self._ball_y, 
-                                          QColor(255, 0, 255) if self._ball_x <= 65 else QColor(0, 255, 255), 40)
-
-        # Гол
-        if self._ball_x <= 0:
-            self._score2 += 1
-            self.reset_ball()
-        elif self._ball_x >= 790:
-            self._score1 += 1
-            self.reset_ball()
-
-        # Движение ракеток
-        paddle_speed = 10
-        if self.move_up1 and self._paddle1_y > 0:
-            self._paddle1_y -= paddle_speed
-        if self.move_down1 and self._paddle1_y < 500:
-            self._paddle1_y += paddle_speed
-        if self.move_up2 and self._paddle2_y > 0:
-            self._paddle2_y -= paddle_speed
-        if self.move_down2 and self._paddle2_y < 500:
-            self._paddle2_y += paddle_speed
 
-        self.particles.update()
-        self.update()
+        self.particles.update(frame_dt)
+        if ambient:
+            self._damage = self.damage_region()
+            self.update()
+        else:
+            damage = self.damage_region()
+            self.update(damage.united(self._damage))
+            self._damage = damage
+        self.profiler.lap('effects', started)
+        self.profiler.record('frame', int(elapsed * 1e9))
+
+    def damage_region(self):
+        # Области, где в этом кадре что-то нарисовано поверх фона
+        region = QRegion(int(self.render_ball_x) - 4, int(self.render_ball_y) - 4, 19, 19)
+        if len(self.trail):
+            left, top, right, bottom = self.trail.bounds()
+            region = region.united(QRect(int(left) - 8, int(top) - 8,
+                                         int(right - left) + 17, int(bottom - top) + 17))
+        for x, paddle_y in ((50, self.render_paddle1_y), (740, self.render_paddle2_y)):
+            region = region.united(QRect(x - 5, int(paddle_y) - 5,
+                                         self.paddle_width + 10, self.paddle_height + 10))
+
+        score = (self.engine.score1, self.engine.score2)
+        if score != self._damage_score:
+            region = region.united(QRect(180, 10, 200, 50)).united(QRect(530, 10, 200, 50))
+            self._damage_score = score
+
+        tile = 50
+        for tx, ty in self.particles.occupied_tiles(tile):
+            region = region.united(QRect(tx * tile - 7, ty * tile - 7, tile + 14, tile + 14))
+        if self.profiler.enabled:
+            region = region.united(self.PROFILER_RECT)
+        return region
 
     def reset_ball(self):
-        self._ball_x, self._ball_y = 400, 300
-        self._ball_dx = random.choice([6, -6])
-        self._ball_dy = random.choice([4, -4, 5, -5, 6, -6])
-        self.trail_positions = []
+        self.engine.reset_ball()
+        self.on_ball_reset()
+
+    def on_ball_reset(self):
+        self.trail.clear()
         # Эффект при сбросе мяча
-        for _ in range(30):
-            self.particles.add_particle(400, 300, QColor(255, 255, 0), 50)
+        self.particles.add_burst(400, 300, QColor(255, 255, 0), 30, 50)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_W:
@@ -853,6 +1976,22 @@ class SynthwaveGameWidget(QWidget):
             self.move_up2 = True
         elif event.key() == Qt.Key_Down:
             self.move_down2 = True
+        elif event.key() == Qt.Key_C and not event.isAutoRepeat():
+            self.cycle_cpu_opponent()
+        elif event.key() == Qt.Key_F3 and not event.isAutoRepeat():
+            self.profiler.enabled = not self.profiler.enabled
+            self.update()
+        elif event.key() == Qt.Key_F4 and not event.isAutoRepeat():
+            self.profiler.dump(os.environ.get('PONG_PROFILE_FILE', 'pong_profile.json'))
+
+    def cycle_cpu_opponent(self):
+        # Выкл -> легкий -> обычный -> сложный -> выкл
+        levels = [None, 'easy', 'normal', 'hard']
+        current = self.cpu_opponent.difficulty if self.cpu_opponent else None
+        difficulty = levels[(levels.index(current) + 1) % len(levels)]
+        self.cpu_opponent = PredictiveController(difficulty) if difficulty else None
+        mode = f"CPU {difficulty.upper()}" if difficulty else "2 PLAYERS"
+        self.window().setWindowTitle(f"🎮 SYNTHWAVE PONG - GAME ACTIVE - {mode}")
 
     def keyReleaseEvent(self, event):
         if event.key() == Qt.Key_W:
@@ -865,6 +2004,11 @@ class SynthwaveGameWidget(QWidget):
             self.move_down2 = False
 
 if __name__ == '__main__':
+    # Турнир ботов без окон: python pong.py --tournament [аргументы]
+    if len(sys.argv) > 1 and sys.argv[1] == '--tournament':
+        from pong_tournament import main
+        sys.exit(main(sys.argv[2:]))
+
     app = QApplication(sys.argv)
     
     # Устанавливает стиль всей игры
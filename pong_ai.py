@@ -0,0 +1,65 @@
+import random
+from collections import deque
+
+from pong_physics import TOP_WALL, BOTTOM_WALL, LEFT_PADDLE_FACE, RIGHT_PADDLE_FACE
+
+
+def predict_y(x, y, dx, dy, face_x, top=TOP_WALL, bottom=BOTTOM_WALL):
+    # Где мяч пересечет линию face_x с учетом отражений от стен, за O(1).
+    # None, если мяч летит в другую сторону.
+    if dx == 0 or (face_x - x) * dx < 0:
+        return None
+    y_raw = y + dy * (face_x - x) / dx
+    # Отражения между стенами "разворачиваем" как пилу с периодом 2 * высота
+    height = bottom - top
+    if height <= 0:
+        return top
+    offset = (y_raw - top) % (2 * height)
+    return top + (offset if offset <= height else 2 * height - offset)
+
+
+class PredictiveController:
+    # Компьютерный соперник: видит мяч с задержкой reaction_frames шагов,
+    # считает точку перехвата аналитически и ошибается на случайные error пикселей
+    DIFFICULTY = {
+        'easy': (30, 70),
+        'normal': (15, 30),
+        'hard': (6, 10),
+        'perfect': (0, 0),
+    }
+
+    def __init__(self, difficulty='normal', reaction_frames=None, error=None, seed=None):
+        reaction, miss = self.DIFFICULTY[difficulty]
+        self.difficulty = difficulty
+        self.reaction_frames = reaction if reaction_frames is None else reaction_frames
+        self.error = miss if error is None else error
+        self.rng = random.Random(seed)
+        self.seen = deque(maxlen=self.reaction_frames + 1)
+        self.heading = None
+        self.aim = 0.0
+
+    def move(self, engine, side):
+        self.seen.append((engine.ball_x, engine.ball_y, engine.ball_dx, engine.ball_dy))
+        x, y, dx, dy = self.seen[0]
+
+        face_x = LEFT_PADDLE_FACE if side == 1 else RIGHT_PADDLE_FACE
+        heading = dx < 0 if side == 1 else dx > 0
+        if heading != self.heading:
+            # Новый заход мяча - новая ошибка прицеливания
+            self.heading = heading
+            self.aim = self.rng.uniform(-self.error, self.error)
+
+        target = predict_y(x, y, dx, dy, face_x) if heading else None
+        if target is None:
+            # Мяч улетает - возвращаемся в центр
+            target = (BOTTOM_WALL - TOP_WALL) / 2
+        target += 5 + self.aim
+
+        paddle_y = engine.paddle1_y if side == 1 else engine.paddle2_y
+        offset = target - (paddle_y + engine.paddle_height / 2)
+        dead_zone = engine.paddle_speed * engine.step_scale
+        if offset < -dead_zone:
+            return -1
+        if offset > dead_zone:
+            return 1
+        return 0
@@ -0,0 +1,135 @@
+import numpy as np
+
+from pong_engine import FIELD_WIDTH, FIELD_HEIGHT, PADDLE_SPEED, SERVE_DX, SERVE_DY
+from pong_physics import (TOP_WALL, BOTTOM_WALL, LEFT_PADDLE_FACE, RIGHT_PADDLE_FACE,
+                          LEFT_GOAL, RIGHT_GOAL, PADDLE_SPEEDUP)
+
+# Коды поверхностей для векторной проверки столкновений
+NONE, WALL, LEFT_PADDLE, RIGHT_PADDLE, LEFT_GOAL_HIT, RIGHT_GOAL_HIT = range(6)
+
+
+class BatchPongEngine:
+    # N независимых матчей: каждая строка массивов - состояние одного матча.
+    # Правила те же, что у PongEngine, но считаются сразу для всей пачки.
+    def __init__(self, matches, physics_hz=120, seed=None, paddle_speed=PADDLE_SPEED,
+                 speedup=PADDLE_SPEEDUP, serve_dx=SERVE_DX, serve_dy=SERVE_DY,
+                 paddle_height=100, max_bounces=16):
+        self.matches = matches
+        self.rng = np.random.default_rng(seed)
+        self.step_scale = 60 / physics_hz
+        self.paddle_speed = paddle_speed
+        self.speedup = speedup
+        self.serve_dx = np.asarray(serve_dx, dtype=np.float64)
+        self.serve_dy = np.asarray(serve_dy, dtype=np.float64)
+        self.paddle_height = paddle_height
+        self.max_bounces = max_bounces
+
+        self.ball_x = np.full(matches, FIELD_WIDTH / 2)
+        self.ball_y = np.full(matches, FIELD_HEIGHT / 2)
+        self.ball_dx = np.full(matches, 6.0)
+        self.ball_dy = np.full(matches, 6.0)
+        self.paddle1_y = np.full(matches, 250.0)
+        self.paddle2_y = np.full(matches, 250.0)
+        self.score1 = np.zeros(matches, dtype=np.int64)
+        self.score2 = np.zeros(matches, dtype=np.int64)
+        # Число отбиваний в текущем розыгрыше и всего
+        self.rally = np.zeros(matches, dtype=np.int64)
+        self.hits = np.zeros(matches, dtype=np.int64)
+        self.frame = 0
+
+    def reset_ball(self, rows):
+        # Подача в выбранных матчах (rows - индексы или булева маска)
+        rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows)
+        if not len(rows):
+            return
+        self.ball_x[rows] = FIELD_WIDTH / 2
+        self.ball_y[rows] = FIELD_HEIGHT / 2
+        self.ball_dx[rows] = self.rng.choice(self.serve_dx, len(rows))
+        self.ball_dy[rows] = self.rng.choice(self.serve_dy, len(rows))
+        self.rally[rows] = 0
+
+    def sweep(self):
+        # Векторный аналог pong_physics.sweep_ball: на каждой итерации
+        # обрабатываются только матчи, у которых мяч еще во что-то врезался
+        scale = self.step_scale
+        remaining = np.ones(self.matches)
+        goals = np.full(self.matches, NONE, dtype=np.int8)
+        rows = np.arange(self.matches)
+
+        for _ in range(self.max_bounces + 1):
+            if not len(rows):
+                break
+            x, y = self.ball_x[rows], self.ball_y[rows]
+            vx, vy = self.ball_dx[rows] * scale, self.ball_dy[rows] * scale
+            rem = remaining[rows]
+            best = rem.copy()
+            surface = np.full(len(rows), NONE, dtype=np.int8)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Стены
+                t = np.where(vy < 0, np.maximum((TOP_WALL - y) / vy, 0.0),
+                             np.where(vy > 0, np.maximum((BOTTOM_WALL - y) / vy, 0.0), np.inf))
+                hit = t <= best
+                best[hit], surface[hit] = t[hit], WALL
+
+                # Ракетки (только с лицевой стороны)
+                t = (LEFT_PADDLE_FACE - x) / vx
+                contact_y = y + vy * t
+                hit = ((vx < 0) & (x >= LEFT_PADDLE_FACE) & (t <= best)
+                       & (contact_y >= self.paddle1_y[rows])
+                       & (contact_y <= self.paddle1_y[rows] + self.paddle_height))
+                best[hit], surface[hit] = t[hit], LEFT_PADDLE
+
+                t = (RIGHT_PADDLE_FACE - x) / vx
+                contact_y = y + vy * t
+                hit = ((vx > 0) & (x <= RIGHT_PADDLE_FACE) & (t <= best)
+                       & (contact_y >= self.paddle2_y[rows])
+                       & (contact_y <= self.paddle2_y[rows] + self.paddle_height))
+                best[hit], surface[hit] = t[hit], RIGHT_PADDLE
+
+                # Ворота
+                t = np.where(vx < 0, np.maximum((LEFT_GOAL - x) / vx, 0.0),
+                             np.where(vx > 0, np.maximum((RIGHT_GOAL - x) / vx, 0.0), np.inf))
+                hit = (t < best) | ((t == best) & (surface == NONE))
+                best[hit] = t[hit]
+                surface[hit] = np.where(vx[hit] < 0, LEFT_GOAL_HIT, RIGHT_GOAL_HIT)
+
+            # Без касаний мяч проходит остаток шага
+            free = surface == NONE
+            best[free] = rem[free]
+            self.ball_x[rows] = x + vx * best
+            self.ball_y[rows] = y + vy * best
+            remaining[rows] = rem - best
+
+            wall = rows[surface == WALL]
+            self.ball_dy[wall] *= -1
+            paddle = rows[(surface == LEFT_PADDLE) | (surface == RIGHT_PADDLE)]
+            self.ball_dx[paddle] *= -self.speedup  # Ускорение после отскока
+            self.rally[paddle] += 1
+            self.hits[paddle] += 1
+
+            goal = (surface == LEFT_GOAL_HIT) | (surface == RIGHT_GOAL_HIT)
+            goals[rows[goal]] = surface[goal]
+            rows = rows[(surface == WALL) | (surface == LEFT_PADDLE) | (surface == RIGHT_PADDLE)]
+        return goals
+
+    def step(self, inputs1=0, inputs2=0):
+        # inputs1/inputs2 - направление ракеток (-1, 0, 1): число или массив на N матчей.
+        # Возвращает булевы маски матчей, где забил первый и второй игрок.
+        goals = self.sweep()
+        scored1 = goals == RIGHT_GOAL_HIT
+        scored2 = goals == LEFT_GOAL_HIT
+        self.score1 += scored1
+        self.score2 += scored2
+        self.reset_ball(scored1 | scored2)
+
+        # Движение ракеток
+        speed = self.paddle_speed * self.step_scale
+        lowest = FIELD_HEIGHT - self.paddle_height
+        for paddle, move in ((self.paddle1_y, inputs1), (self.paddle2_y, inputs2)):
+            move = np.broadcast_to(np.sign(move), paddle.shape)
+            paddle -= speed * ((move < 0) & (paddle > 0))
+            paddle += speed * ((move > 0) & (paddle < lowest))
+
+        self.frame += 1
+        return scored1, scored2
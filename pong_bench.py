@@ -0,0 +1,252 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Бенчмарки идут без экрана
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# Окно входа не должно создавать файл базы пользователей
+os.environ.setdefault('PONG_USERS_DB', ':memory:')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QColor, QImage, QPainter
+
+from pong import (FrameProfiler, ScoreBoard, SynthwaveGameWidget, SynthwaveLoginWindow,
+                  SynthwaveMenuWindow)
+from pong_ai import PredictiveController
+
+FRAME_DT = 1 / 60
+
+
+def run_frames(frames, update, widget, image, profiler):
+    started = time.perf_counter()
+    for _ in range(frames):
+        t = profiler.begin()
+        update()
+        t = profiler.lap('update', t)
+        widget.render(image)
+        profiler.lap('render', t)
+    return time.perf_counter() - started
+
+
+def scenario_idle_menu(seed):
+    window = SynthwaveMenuWindow()
+    window.particle_timer.stop()
+    window.particles.adaptive = False
+    return window, window.update_particles
+
+
+def game_widget(seed):
+    widget = SynthwaveGameWidget(physics_hz=120, render_hz=60)
+    widget.loop.stop()
+    widget.engine.rng.seed(seed)
+    # Фазы считаются за весь прогон: гистограмма с шагом 1 мкс вместо окна последних кадров
+    widget.profiler = FrameProfiler(enabled=True, bucket_ns=1_000)
+    # LOD зависит от скорости машины - отключаем, чтобы нагрузка была одинаковой
+    widget.particles.adaptive = False
+    return widget
+
+
+def game_frame(widget, before_step=None):
+    # Один кадр 60 Гц: нужное число шагов физики и отрисовка эффектов
+    def frame():
+        steps = round(FRAME_DT / widget.loop.physics_dt)
+        for _ in range(steps):
+            if before_step:
+                before_step()
+            widget.step_physics()
+        widget.render_frame(1.0, FRAME_DT)
+    return frame
+
+
+def scenario_rally(seed):
+    # Два идеальных бота - розыгрыш почти не прерывается
+    widget = game_widget(seed)
+    left = PredictiveController('perfect', seed=seed)
+    widget.cpu_opponent = PredictiveController('perfect', seed=seed + 1)
+
+    def steer():
+        move = left.move(widget.engine, 1)
+        widget.move_up1, widget.move_down1 = move < 0, move > 0
+    return widget, game_frame(widget, steer)
+
+
+def scenario_particle_storm(seed):
+    # Каждый кадр мяч сбрасывается и выпускает новую пачку частиц
+    widget = game_widget(seed)
+    frame = game_frame(widget)
+
+    def storm():
+        widget.reset_ball()
+        frame()
+    return widget, storm
+
+
+def scenario_login_flood(seed):
+    # Эффект успешного входа (100 частиц) каждый кадр
+    window = SynthwaveLoginWindow()
+    window.particle_timer.stop()
+    window.particles.adaptive = False
+
+    def flood():
+        window.particles.add_burst(300, 275, QColor(0, 255, 0), 100, 80)
+        window.update_particles()
+    return window, flood
+
+
+SCENARIOS = {
+    'idle_menu': (scenario_idle_menu, 600),
+    'rally': (scenario_rally, 60 * 60 * 10),
+    'particle_storm': (scenario_particle_storm, 1200),
+    'login_flood': (scenario_login_flood, 600),
+}
+
+
+def percentiles(profiler, phase, session=False):
+    p50, p95, p99 = (profiler.session_percentiles if session else profiler.percentiles)(phase)
+    return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+def run_scenario(name, scale, seed, trace_memory=False):
+    factory, frames = SCENARIOS[name]
+    frames = max(1, int(frames * scale))
+    # Эффекты используют глобальные генераторы - фиксируем их для повторяемости
+    random.seed(seed)
+    np.random.seed(seed)
+    widget, update = factory(seed)
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    # Окно перцентилей на весь прогон
+    profiler = FrameProfiler(window=frames, enabled=True)
+
+    # tracemalloc заметно замедляет Python, поэтому только по запросу
+    if trace_memory:
+        tracemalloc.start()
+    elapsed = run_frames(frames, update, widget, image, profiler)
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        'frames': frames,
+        'seconds': elapsed,
+        'fps': frames / elapsed,
+        'update': percentiles(profiler, 'update'),
+        'render': percentiles(profiler, 'render'),
+        'live_particles': len(widget.particles),
+        'particle_lod': widget.particles.lod,
+        # Пик памяти процесса (Linux - КБ, macOS - байты). Каждый сценарий идет
+        # в своем процессе, поэтому пик относится только к нему
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if trace_memory:
+        result['peak_python_kb'] = peak // 1024
+    game_profiler = getattr(widget, 'profiler', None)
+    if game_profiler is not None:
+        # 'frame' здесь - всегда FRAME_DT, который game_frame передает в render_frame,
+        # а не измерение, поэтому в отчет не попадает
+        result['phases'] = {phase: percentiles(game_profiler, phase, session=True)
+                            for phase in game_profiler.histograms if phase != 'frame'}
+    widget.close()
+    return result
+
+
+def run_isolated(name, scale, seed, trace_memory=False):
+    # Точка входа дочернего процесса: свое приложение Qt и свой ru_maxrss
+    app = QApplication.instance() or QApplication([])
+    result = run_scenario(name, scale, seed, trace_memory)
+    app.processEvents()
+    return result
+
+
+def render_score(ratio):
+    image = QImage(int(300 * ratio), int(80 * ratio), QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(ratio)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    ScoreBoard(ratio).draw(painter, 30, 50, "P1: ", 42, QColor(255, 0, 255))
+    painter.end()
+    # Сравниваем в логических пикселях
+    image = image.scaled(300, 80, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    image = image.convertToFormat(QImage.Format_ARGB32)
+    pixels = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), np.uint8)
+    return pixels.reshape(80, image.bytesPerLine() // 4, 4)[:, :300, 3] / 255
+
+
+def check_scoreboard_hidpi():
+    # Счет на HiDPI (ratio 2) должен совпадать со счетом при ratio 1 с точностью до сглаживания
+    difference = float(np.abs(render_score(1.0) - render_score(2.0)).mean())
+    return {'mean_alpha_difference': difference, 'ok': difference < 0.02}
+
+
+CHECKS = {
+    'scoreboard_hidpi': check_scoreboard_hidpi,
+}
+
+
+def run_checks():
+    app = QApplication.instance() or QApplication([])
+    results = {name: check() for name, check in CHECKS.items()}
+    app.processEvents()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offscreen rendering/physics benchmarks")
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS),
+                        help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply the number of frames")
+    parser.add_argument('--seed', type=int, default=2084)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="also report peak Python allocations via tracemalloc (slower)")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    # spawn, а не fork: дочерний процесс не наследует память и состояние Qt родителя
+    context = multiprocessing.get_context('spawn')
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': os.environ.get('QT_QPA_PLATFORM'),
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            report['scenarios'][name] = executor.submit(
+                run_isolated, name, args.scale, args.seed, args.trace_memory).result()
+    # Проверки корректности отрисовки, без которых цифры сравнивать бессмысленно
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        report['checks'] = executor.submit(run_checks).result()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if all(check['ok'] for check in report['checks'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
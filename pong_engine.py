@@ -0,0 +1,79 @@
+import random
+
+from pong_physics import sweep_ball
+
+# Размеры поля в пикселях, скорости - в пикселях за 1/60 секунды
+FIELD_WIDTH = 800
+FIELD_HEIGHT = 600
+PADDLE_SPEED = 10
+SERVE_DX = (6, -6)
+SERVE_DY = (4, -4, 5, -5, 6, -6)
+
+
+class PongEngine:
+    # Состояние и правила игры без Qt: работает и в окне, и без него
+    def __init__(self, physics_hz=120, seed=None):
+        self.rng = random.Random(seed)
+        self.step_scale = 60 / physics_hz
+        self.paddle_height, self.paddle_width = 100, 15
+        self.paddle_speed = PADDLE_SPEED
+        self.ball_x, self.ball_y = 400, 300
+        self.ball_dx, self.ball_dy = 6, 6
+        self.paddle1_y, self.paddle2_y = 250, 250
+        self.score1, self.score2 = 0, 0
+        self.frame = 0
+        self.save_previous_state()
+
+    def save_previous_state(self):
+        self.prev_ball_x, self.prev_ball_y = self.ball_x, self.ball_y
+        self.prev_paddle1_y, self.prev_paddle2_y = self.paddle1_y, self.paddle2_y
+
+    def reset_ball(self):
+        self.ball_x, self.ball_y = FIELD_WIDTH // 2, FIELD_HEIGHT // 2
+        self.ball_dx = self.rng.choice(SERVE_DX)
+        self.ball_dy = self.rng.choice(SERVE_DY)
+        self.prev_ball_x, self.prev_ball_y = self.ball_x, self.ball_y
+
+    def step(self, inputs=(0, 0)):
+        # inputs - направление каждой ракетки: -1 вверх, 0 стоит, 1 вниз.
+        # Возвращает касания за шаг, чтобы интерфейс мог добавить эффекты.
+        self.save_previous_state()
+        scale = self.step_scale
+
+        # Движение мяча с непрерывной проверкой столкновений
+        self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, contacts = sweep_ball(
+            self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, scale,
+            self.paddle1_y, self.paddle2_y, self.paddle_height)
+
+        # Гол
+        if contacts:
+            surface = contacts[-1].surface
+            if surface == 'left_goal':
+                self.score2 += 1
+                self.reset_ball()
+            elif surface == 'right_goal':
+                self.score1 += 1
+                self.reset_ball()
+
+        # Движение ракеток
+        move1, move2 = inputs
+        speed = self.paddle_speed * scale
+        lowest = FIELD_HEIGHT - self.paddle_height
+        if move1 < 0 and self.paddle1_y > 0:
+            self.paddle1_y -= speed
+        elif move1 > 0 and self.paddle1_y < lowest:
+            self.paddle1_y += speed
+        if move2 < 0 and self.paddle2_y > 0:
+            self.paddle2_y -= speed
+        elif move2 > 0 and self.paddle2_y < lowest:
+            self.paddle2_y += speed
+
+        self.frame += 1
+        return contacts
+
+    def interpolate(self, blend):
+        # Положения мяча и ракеток между двумя последними шагами
+        return (self.prev_ball_x + (self.ball_x - self.prev_ball_x) * blend,
+                self.prev_ball_y + (self.ball_y - self.prev_ball_y) * blend,
+                self.prev_paddle1_y + (self.paddle1_y - self.prev_paddle1_y) * blend,
+                self.prev_paddle2_y + (self.paddle2_y - self.prev_paddle2_y) * blend)
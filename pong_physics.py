@@ -0,0 +1,82 @@
+from collections import namedtuple
+
+# Точка касания: доля шага, координаты мяча, нормаль поверхности и ее имя
+Contact = namedtuple('Contact', 'time x y normal_x normal_y surface')
+
+# Границы поля в координатах левого верхнего угла мяча
+TOP_WALL = 0
+BOTTOM_WALL = 590
+LEFT_PADDLE_FACE = 65
+RIGHT_PADDLE_FACE = 725
+LEFT_GOAL = 0
+RIGHT_GOAL = 790
+PADDLE_SPEEDUP = 1.05
+
+NORMALS = {
+    'top_wall': (0, 1),
+    'bottom_wall': (0, -1),
+    'left_paddle': (1, 0),
+    'right_paddle': (-1, 0),
+    'left_goal': (1, 0),
+    'right_goal': (-1, 0),
+}
+
+
+def sweep_ball(x, y, dx, dy, dt, paddle1_y, paddle2_y, paddle_height, max_bounces=16):
+    # Непрерывная проверка столкновений: мяч движется по отрезку за шаг dt,
+    # находим точное время первого касания, отражаем и продолжаем остаток шага.
+    # Возвращает новое состояние мяча и список касаний по порядку.
+    contacts = []
+    remaining = 1.0
+    for _ in range(max_bounces + 1):
+        vx, vy = dx * dt, dy * dt
+        best_t = remaining
+        surface = None
+
+        # Стены (если мяч уже за стеной, отскок происходит сразу)
+        if vy < 0:
+            t = max((TOP_WALL - y) / vy, 0.0)
+            if t <= best_t:
+                best_t, surface = t, 'top_wall'
+        elif vy > 0:
+            t = max((BOTTOM_WALL - y) / vy, 0.0)
+            if t <= best_t:
+                best_t, surface = t, 'bottom_wall'
+
+        # Ракетки и ворота
+        if vx < 0:
+            if x >= LEFT_PADDLE_FACE:
+                t = (LEFT_PADDLE_FACE - x) / vx
+                if t <= best_t and paddle1_y <= y + vy * t <= paddle1_y + paddle_height:
+                    best_t, surface = t, 'left_paddle'
+            t = max((LEFT_GOAL - x) / vx, 0.0)
+            if t < best_t or (t == best_t and surface is None):
+                best_t, surface = t, 'left_goal'
+        elif vx > 0:
+            if x <= RIGHT_PADDLE_FACE:
+                t = (RIGHT_PADDLE_FACE - x) / vx
+                if t <= best_t and paddle2_y <= y + vy * t <= paddle2_y + paddle_height:
+                    best_t, surface = t, 'right_paddle'
+            t = max((RIGHT_GOAL - x) / vx, 0.0)
+            if t < best_t or (t == best_t and surface is None):
+                best_t, surface = t, 'right_goal'
+
+        if surface is None:
+            x += vx * remaining
+            y += vy * remaining
+            break
+
+        x += vx * best_t
+        y += vy * best_t
+        remaining -= best_t
+        normal_x, normal_y = NORMALS[surface]
+        contacts.append(Contact(1.0 - remaining, x, y, normal_x, normal_y, surface))
+
+        if surface in ('top_wall', 'bottom_wall'):
+            dy = -dy
+        elif surface in ('left_paddle', 'right_paddle'):
+            dx *= -PADDLE_SPEEDUP  # Ускорение после отскока
+        else:
+            # Гол: дальше мяч не двигается, его сбросит вызывающий код
+            break
+    return x, y, dx, dy, contacts
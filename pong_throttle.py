@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict, deque
+
+
+class LoginThrottle:
+    # Неудачные входы по именам: у каждого имени кольцо из последних history
+    # отметок времени, а самих имен хранится не больше max_users (вытесняются
+    # самые давние). Память фиксирована, каждая операция - O(1) амортизированно.
+    def __init__(self, window=300, free_attempts=3, captcha_after=3, base_delay=1.0,
+                 max_delay=60.0, history=16, max_users=1024, clock=time.monotonic):
+        self.window = window
+        self.free_attempts = free_attempts
+        self.captcha_after = captcha_after
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.history = history
+        self.max_users = max_users
+        self.clock = clock
+        # имя -> [кольцо отметок неудач, время окончания блокировки, капча решена]
+        self.users = OrderedDict()
+
+    def _entry(self, username, now):
+        entry = self.users.get(username)
+        if entry is None:
+            return None
+        failures = entry[0]
+        # Отметки идут по возрастанию - устаревшие всегда в начале кольца
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self.users[username]
+            return None
+        return entry
+
+    def failures(self, username, now=None):
+        entry = self._entry(username, self.clock() if now is None else now)
+        return len(entry[0]) if entry else 0
+
+    def retry_after(self, username, now=None):
+        # Сколько секунд ждать до следующей попытки (0 - можно сейчас)
+        now = self.clock() if now is None else now
+        entry = self._entry(username, now)
+        return max(0.0, entry[1] - now) if entry else 0.0
+
+    def needs_captcha(self, username, now=None):
+        # После captcha_after ошибок каждая следующая попытка - только после капчи
+        entry = self._entry(username, self.clock() if now is None else now)
+        return bool(entry) and len(entry[0]) >= self.captcha_after and not entry[2]
+
+    def captcha_passed(self, username):
+        # Капча решена: разрешает одну попытку, следующая ошибка снова ее потребует
+        entry = self.users.get(username)
+        if entry is not None:
+            entry[2] = True
+
+    def record_failure(self, username, now=None):
+        # Первые free_attempts ошибок без задержки, дальше задержка удваивается
+        now = self.clock() if now is None else now
+        entry = self._entry(username, now)
+        if entry is None:
+            entry = self.users[username] = [deque(maxlen=self.history), 0.0, False]
+        self.users.move_to_end(username)
+        failures = entry[0]
+        failures.append(now)
+        entry[2] = False
+        extra = len(failures) - self.free_attempts
+        if extra > 0:
+            entry[1] = now + min(self.max_delay, self.base_delay * 2 ** (extra - 1))
+        while len(self.users) > self.max_users:
+            self.users.popitem(last=False)
+        return self.retry_after(username, now)
+
+    def record_success(self, username):
+        self.users.pop(username, None)
@@ -0,0 +1,188 @@
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from pong_ai import PredictiveController
+from pong_engine import PongEngine
+
+
+# Контроллер ракетки - любой объект с методом move(engine, side),
+# возвращающим -1 (вверх), 0 или 1 (вниз). side: 1 - левая, 2 - правая.
+class IdleController:
+    def move(self, engine, side):
+        return 0
+
+
+class RandomController:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def move(self, engine, side):
+        return self.rng.choice((-1, 0, 1))
+
+
+class TrackingController:
+    # Следует за мячом по вертикали
+    def __init__(self, dead_zone=10):
+        self.dead_zone = dead_zone
+
+    def move(self, engine, side):
+        paddle_y = engine.paddle1_y if side == 1 else engine.paddle2_y
+        offset = engine.ball_y + 5 - (paddle_y + engine.paddle_height / 2)
+        if offset < -self.dead_zone:
+            return -1
+        if offset > self.dead_zone:
+            return 1
+        return 0
+
+
+CONTROLLERS = {
+    'idle': IdleController,
+    'random': RandomController,
+    'tracking': TrackingController,
+    'predictive': PredictiveController,
+    'predictive-easy': partial(PredictiveController, 'easy'),
+    'predictive-hard': partial(PredictiveController, 'hard'),
+    'predictive-perfect': partial(PredictiveController, 'perfect'),
+}
+
+
+def load_controller(spec, seed=None):
+    # Встроенное имя или путь вида "module:ClassName".
+    # seed передается, только если контроллер его принимает.
+    if spec in CONTROLLERS:
+        factory = CONTROLLERS[spec]
+    else:
+        module_name, _, class_name = spec.partition(':')
+        if not class_name:
+            raise ValueError(f"Unknown controller {spec!r}, expected one of "
+                             f"{sorted(CONTROLLERS)} or 'module:ClassName'")
+        factory = getattr(importlib.import_module(module_name), class_name)
+    try:
+        accepts_seed = 'seed' in inspect.signature(factory).parameters
+    except (TypeError, ValueError):
+        accepts_seed = False
+    return factory(seed=seed) if accepts_seed else factory()
+
+
+def play_match(spec1, spec2, seed, points=11, max_frames=120 * 60 * 10, physics_hz=120):
+    # Один матч без окна по правилам PongEngine
+    engine = PongEngine(physics_hz, seed=seed)
+    engine.reset_ball()
+    # Свой seed у каждой стороны, чтобы матч с тем же seed повторялся целиком
+    left = load_controller(spec1, None if seed is None else seed * 2 + 1)
+    right = load_controller(spec2, None if seed is None else seed * 2 + 2)
+    rallies = []
+    rally = 0
+    while engine.frame < max_frames and max(engine.score1, engine.score2) < points:
+        contacts = engine.step((left.move(engine, 1), right.move(engine, 2)))
+        for contact in contacts:
+            if contact.surface in ('left_paddle', 'right_paddle'):
+                rally += 1
+            elif contact.surface in ('left_goal', 'right_goal'):
+                rallies.append(rally)
+                rally = 0
+    return {
+        'left': spec1,
+        'right': spec2,
+        'score1': engine.score1,
+        'score2': engine.score2,
+        'frames': engine.frame,
+        'rallies': rallies,
+    }
+
+
+def schedule(specs, games, seed):
+    # Круговой турнир: каждая пара играет games матчей, стороны чередуются
+    rng = random.Random(seed)
+    matches = []
+    for a, b in itertools.combinations(specs, 2):
+        for game in range(games):
+            left, right = (a, b) if game % 2 == 0 else (b, a)
+            matches.append((left, right, rng.getrandbits(32)))
+    return matches
+
+
+def summarize(specs, results):
+    table = {spec: {'played': 0, 'wins': 0, 'losses': 0, 'draws': 0, 'rallies': []}
+             for spec in specs}
+    for result in results:
+        left, right = table[result['left']], table[result['right']]
+        for row in (left, right):
+            row['played'] += 1
+            row['rallies'].extend(result['rallies'])
+        if result['score1'] > result['score2']:
+            left['wins'] += 1
+            right['losses'] += 1
+        elif result['score2'] > result['score1']:
+            right['wins'] += 1
+            left['losses'] += 1
+        else:
+            left['draws'] += 1
+            right['draws'] += 1
+
+    summary = {}
+    for spec, row in table.items():
+        rallies = row.pop('rallies')
+        row['win_rate'] = row['wins'] / row['played'] if row['played'] else 0.0
+        row['rally_mean'] = statistics.fmean(rallies) if rallies else 0.0
+        row['rally_median'] = statistics.median(rallies) if rallies else 0
+        row['rally_max'] = max(rallies, default=0)
+        summary[spec] = row
+    return summary
+
+
+def run_tournament(specs, games=10, points=11, max_frames=120 * 60 * 10, workers=None, seed=None):
+    matches = schedule(specs, games, seed)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_match, left, right, match_seed, points, max_frames)
+                   for left, right, match_seed in matches]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return summarize(specs, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless round-robin tournament between paddle controllers")
+    parser.add_argument('controllers', nargs='*', default=sorted(CONTROLLERS),
+                        help="built-in names or module:ClassName")
+    parser.add_argument('--games', type=int, default=10, help="matches per pairing")
+    parser.add_argument('--points', type=int, default=11, help="points needed to win a match")
+    parser.add_argument('--max-frames', type=int, default=120 * 60 * 10,
+                        help="physics steps before a match is scored as is")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', dest='json_path', help="write results to this file")
+    args = parser.parse_args(argv)
+
+    if len(args.controllers) < 2:
+        parser.error("need at least two controllers")
+    started = time.perf_counter()
+    summary = run_tournament(args.controllers, args.games, args.points, args.max_frames,
+                             args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'CONTROLLER':<30} {'W':>5} {'L':>5} {'D':>5} {'WIN%':>7} {'RALLY':>7} {'MAX':>5}")
+    for spec, row in sorted(summary.items(), key=lambda item: -item[1]['win_rate']):
+        print(f"{spec:<30} {row['wins']:>5} {row['losses']:>5} {row['draws']:>5} "
+              f"{row['win_rate'] * 100:>6.1f}% {row['rally_mean']:>7.2f} {row['rally_max']:>5}")
+    print(f"{elapsed:.1f}s on {args.workers} workers")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
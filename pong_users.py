@@ -0,0 +1,107 @@
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+
+# Хэширование намеренно медленное: scrypt ~50 мс и 16 МБ памяти на проверку
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+PBKDF2_ITERATIONS = 200_000
+SALT_SIZE = 16
+# Учетные записи, которые раньше были зашиты в окно входа (admin/password123,
+# user/123456, player/pong2024). Хэши посчитаны заранее, чтобы первый запуск
+# не хэшировал пароли в потоке интерфейса; PBKDF2 есть в любой сборке Python.
+DEFAULT_USERS = (
+    ('admin', 'pbkdf2_sha256:200000',
+     bytes.fromhex('08ffca133bc0e0e499b5c7536eac0f1a'),
+     bytes.fromhex('57944be4c514bde0ef7a57c44319f6205b74ae5a2d03a8b97c9f8fba7122b7c7')),
+    ('user', 'pbkdf2_sha256:200000',
+     bytes.fromhex('3de905aff82503cceb6153281a71d480'),
+     bytes.fromhex('745baeb76847aee57f5d9f66416f7be998e6fe5f55ee62173007fff335c3d164')),
+    ('player', 'pbkdf2_sha256:200000',
+     bytes.fromhex('540703c358fce4a6726f5b9bfc719c60'),
+     bytes.fromhex('b2f4d1025339593fd1916500bb7e31e85a6f20c1ef1ac3096b58cef90e67e5a5')),
+)
+
+
+def default_scheme():
+    # scrypt есть не во всех сборках Python (нужен OpenSSL 1.1+) - тогда PBKDF2
+    if hasattr(hashlib, 'scrypt'):
+        return f'scrypt:{SCRYPT_N}:{SCRYPT_R}:{SCRYPT_P}'
+    return f'pbkdf2_sha256:{PBKDF2_ITERATIONS}'
+
+
+def hash_password(password, salt, scheme):
+    # Схема хранится рядом с хэшем вместе с параметрами, чтобы их можно было менять
+    name, *params = scheme.split(':')
+    if name == 'scrypt':
+        n, r, p = map(int, params)
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p)
+    if name == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, int(params[0]))
+    raise ValueError(f"Unknown password scheme {scheme!r}")
+
+
+class UserStore:
+    # Пользователи в SQLite: соль и хэш пароля, уникальный индекс по имени.
+    # Одно соединение на все потоки под блокировкой; хэширование идет вне ее,
+    # поэтому проверки можно запускать из нескольких рабочих потоков сразу.
+    def __init__(self, path=':memory:', seed_rows=DEFAULT_USERS):
+        self.path = path
+        self.scheme = default_scheme()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    scheme TEXT NOT NULL,
+                    salt BLOB NOT NULL,
+                    hash BLOB NOT NULL
+                )""")
+            self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username)")
+        # Хэш для несуществующих имен, чтобы по времени ответа нельзя было их отличить
+        self._dummy = (self.scheme, os.urandom(SALT_SIZE), b'')
+        # seed_rows - готовые строки (имя, схема, соль, хэш), без хэширования
+        if seed_rows and not len(self):
+            with self.lock, self.db:
+                self.db.executemany("INSERT INTO users (username, scheme, salt, hash) VALUES (?, ?, ?, ?)",
+                                    seed_rows)
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __contains__(self, username):
+        return self._record(username) is not None
+
+    def _record(self, username):
+        with self.lock:
+            return self.db.execute("SELECT scheme, salt, hash FROM users WHERE username = ?",
+                                   (username,)).fetchone()
+
+    def register(self, username, password):
+        # False, если имя уже занято
+        if username in self:
+            return False
+        salt = os.urandom(SALT_SIZE)
+        digest = hash_password(password, salt, self.scheme)
+        try:
+            with self.lock, self.db:
+                self.db.execute("INSERT INTO users (username, scheme, salt, hash) VALUES (?, ?, ?, ?)",
+                                (username, self.scheme, salt, digest))
+        except sqlite3.IntegrityError:
+            # Кто-то успел зарегистрировать это имя, пока считался хэш
+            return False
+        return True
+
+    def verify(self, username, password):
+        record = self._record(username)
+        scheme, salt, digest = record or self._dummy
+        ok = hmac.compare_digest(hash_password(password, salt, scheme), digest)
+        return record is not None and ok
+
+    def close(self):
+        with self.lock:
+            self.db.close()